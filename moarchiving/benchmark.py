@@ -0,0 +1,171 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+import hv_plus
+import hv_stats
+
+"""
+Benchmark runner for the hypervolume engines in hv_plus.py (replaces running hv3d_test_time.py,
+hv4d_test_time_R.py and hv4d_test_time_U.py one by one). Each engine is timed phase by phase
+(setup_cdllist, preprocessing, the hypervolume computation) for several sizes and front shapes,
+the median and the interquartile range of each phase are written to a JSON file and, if a baseline
+file is given, the medians are compared to it and the phases that are slower than the given
+threshold are reported as regressions (the exit status is then 1).
+
+Example:
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json --threshold 1.2
+"""
+
+# phases of each engine and the dimension of the points
+ENGINES = {
+    'hv3dplus': (3, ['setup', 'preprocessing', 'hv3dplus']),
+    'hv4dplusR': (4, ['setup', 'hv4dplusR']),
+    'hv4dplusU': (4, ['setup', 'hv4dplusU']),
+}
+DEFAULT_SIZES = {3: [1000, 10000], 4: [100, 1000]}
+SHAPES = ['uniform', 'linear', 'concave', 'convex']
+
+
+"""
+Generates n points in [0, 1]^d with the given shape: 'uniform' (uniformly distributed in the cube,
+mostly dominated), 'linear' (on the simplex), 'concave' (on the unit sphere) or 'convex' (on the
+sphere centered at (1, ..., 1)); the points of the last three shapes are mutually nondominated.
+"""
+def generate_front(shape, n, d, seed=42):
+    rng = np.random.default_rng(seed)
+    if shape == 'uniform':
+        return rng.random((n, d))
+    points = np.abs(rng.standard_normal((n, d)))
+    if shape == 'linear':
+        return points / points.sum(axis=1)[:, None]
+    points = points / np.linalg.norm(points, axis=1)[:, None]
+    if shape == 'concave':
+        return points
+    if shape == 'convex':
+        return 1 - points
+    raise ValueError(f"unknown shape {shape}")
+
+
+def run_once(engine, points, ref):
+    # Returns the time of each phase of the engine and the hypervolume
+    d, phases = ENGINES[engine]
+    times = {}
+
+    tic = time.perf_counter()
+    head = hv_plus.setup_cdllist_points(points, ref)
+    times['setup'] = time.perf_counter() - tic
+
+    if 'preprocessing' in phases:
+        tic = time.perf_counter()
+        hv_plus.preprocessing(head, d)
+        times['preprocessing'] = time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    hv = getattr(hv_plus, engine)(head)
+    times[engine] = time.perf_counter() - tic
+
+    hv_plus.free_cdllist(head)
+    return times, hv
+
+
+def summarize(values):
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    return {'median': float(median), 'iqr': float(q3 - q1), 'times': [float(v) for v in values]}
+
+
+def run(engines=None, shapes=None, sizes=None, repeats=10, seed=42, verbose=True, stats=False):
+    results = []
+    for engine in engines or ENGINES:
+        d, phases = ENGINES[engine]
+        for shape in shapes or SHAPES:
+            for n in sizes or DEFAULT_SIZES[d]:
+                points = generate_front(shape, n, d, seed)
+                ref = [1.1] * d
+                times = {phase: [] for phase in phases + ['total']}
+                for _ in range(repeats):
+                    run_times, hv = run_once(engine, points, ref)
+                    for phase in phases:
+                        times[phase].append(run_times[phase])
+                    times['total'].append(sum(run_times.values()))
+                result = {'engine': engine, 'shape': shape, 'n': n, 'd': d, 'hv': hv,
+                          'phases': {phase: summarize(values) for phase, values in times.items()}}
+                if stats:
+                    # one more run, not timed, with the counters of hv_stats
+                    with hv_stats.collect_stats() as engine_stats:
+                        run_once(engine, points, ref)
+                    result['stats'] = engine_stats.as_dict()
+                results.append(result)
+                if verbose:
+                    total = result['phases']['total']
+                    print(f"{engine:10s} {shape:8s} n={n:<7d} median {total['median']:.4f} s (IQR {total['iqr']:.4f} s)")
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+"""
+Compares the medians of the results to the ones of the baseline (both as returned by run) for the
+cases present in both. Returns a list of (engine, shape, n, phase, ratio) for the phases whose median
+is more than threshold times the median of the baseline.
+"""
+def compare(results, baseline, threshold=1.2):
+    base = {(r['engine'], r['shape'], r['n']): r for r in baseline['results']}
+    regressions = []
+    for r in results['results']:
+        b = base.get((r['engine'], r['shape'], r['n']))
+        if b is None:
+            continue
+        for phase, summary in r['phases'].items():
+            if phase not in b['phases'] or b['phases'][phase]['median'] <= 0:
+                continue
+            ratio = summary['median'] / b['phases'][phase]['median']
+            if ratio > threshold:
+                regressions.append((r['engine'], r['shape'], r['n'], phase, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the hypervolume engines")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), help="engines to run (default: all)")
+    parser.add_argument('--shapes', nargs='+', choices=SHAPES, help="front shapes (default: all)")
+    parser.add_argument('--sizes', nargs='+', type=int, help="numbers of points (default depends on the dimension)")
+    parser.add_argument('--repeats', type=int, default=10, help="repetitions of each case")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--stats', action='store_true', help="add the counters of hv_stats to the results")
+    parser.add_argument('--output', help="JSON file for the results")
+    parser.add_argument('--baseline', help="JSON file with the results to compare with")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="slowdown (ratio of the medians) above which a phase is reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.engines, args.shapes, args.sizes, args.repeats, args.seed, stats=args.stats)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for engine, shape, n, phase, ratio in regressions:
+            print(f"Regression: {engine} {shape} n={n} {phase} is {ratio:.2f} times slower than the baseline")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import numpy as np
+import hv_plus
+
+"""
+Examples for hv3d_batch (hv_plus.py).
+The hypervolumes are compared to the ones computed with hv3dplus, one front at a time.
+"""
+
+def hv_single_front(points, ref):
+    points = points[np.all(points < ref, axis=1)]
+    head = hv_plus.setup_cdllist_points(points, ref)
+    hv_plus.preprocessing(head, 3)
+    hv = hv_plus.hv3dplus(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+print('Example for hv3d_batch - padded array of fronts with the same reference point')
+np.random.seed(9)
+fronts = np.random.rand(5, 30, 3)
+fronts = fronts / np.linalg.norm(fronts, axis=2)[:, :, None]
+ref = [1, 1, 1]
+hvs = hv_plus.hv3d_batch(fronts, ref)
+for front, hv in zip(fronts, hvs):
+    print("Hypervolume:", hv, "(hv3d_batch),", hv_single_front(front, ref), "(hv3dplus)")
+print("\n")
+
+print('Example for hv3d_batch - fronts of different sizes given with offsets, one reference point per front')
+sizes = [3, 10, 0, 25]
+offsets = np.concatenate(([0], np.cumsum(sizes)))
+points = np.random.rand(offsets[-1], 3)
+refs = np.random.uniform(0.8, 1.2, (len(sizes), 3))
+hvs = hv_plus.hv3d_batch(points, refs, offsets)
+for i, hv in enumerate(hvs):
+    print("Hypervolume:", hv, "(hv3d_batch),", hv_single_front(points[offsets[i]:offsets[i + 1]], refs[i]), "(hv3dplus)")
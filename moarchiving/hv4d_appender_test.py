@@ -0,0 +1,28 @@
+import numpy as np
+import hv_plus
+
+"""
+Examples for HV4DAppender (hv_plus.py).
+The points are appended in nondecreasing order of the fourth coordinate and the hypervolume
+after each step is compared to the one computed from scratch with hv4dplusU.
+"""
+
+print('Example for HV4DAppender - random points appended in order of the fourth coordinate')
+np.random.seed(7)
+n = 12
+points = np.random.rand(n, 4)
+points = points[np.argsort(points[:, 3])]
+ref = [1, 1, 1, 1]
+
+appender = hv_plus.HV4DAppender(ref)
+for i, point in enumerate(points):
+    appender.append(point)
+    head = hv_plus.setup_cdllist(points[:i + 1].flatten().tolist(), i + 1, 4, ref)
+    print(f"{i + 1} points: {appender.total_hv()} (HV4DAppender), {hv_plus.hv4dplusU(head)} (hv4dplusU)")
+print("Points nondominated in the last 3-D slice:", len(appender.get_points()))
+
+print('Points with a smaller fourth coordinate than the last one are rejected')
+try:
+    appender.append([0.5, 0.5, 0.5, 0.0])
+except ValueError as e:
+    print("ValueError:", e)
@@ -205,4 +205,34 @@ from hv_plus import hv4dplusR
 
 print("----------------------------------------------------------------------------------")
 print("Hypervolume in 4d - hv4dplusR", hv4dplusR(cdllist_4d))
-print("----------------------------------------------------------------------------------")
\ No newline at end of file
+print("----------------------------------------------------------------------------------")
+
+"""
+Regression test for hv4dplusU: the hypervolume must be the same as the one computed by hv4dplusR,
+also for inputs with ties and dominated points (a point dominated in 3-D must not be added to the
+list sorted by z, otherwise the staircase of the later points is wrong).
+"""
+
+print("------------------------------------------------------------------------------------------")
+print("--------------------------- Hv4d hv4dplusU regression test -------------------------------")
+print("------------------------------------------------------------------------------------------")
+
+from hv_plus import hv4dplusU
+
+mismatches = 0
+for seed in range(60):
+    random.seed(seed)
+    n_random = random.randint(2, 30)
+    points_random = [random.randint(0, 5) for _ in range(4 * n_random)]
+    ref_random = [6, 6, 6, 6]
+    head_R = setup_cdllist(points_random, n_random, 4, ref_random)
+    hv_R = hv4dplusR(head_R)
+    free_cdllist(head_R)
+    head_U = setup_cdllist(points_random, n_random, 4, ref_random)
+    hv_U = hv4dplusU(head_U)
+    free_cdllist(head_U)
+    if abs(hv_R - hv_U) > 1e-9 * max(1, abs(hv_R)):
+        mismatches += 1
+        print("Different hypervolumes for seed", seed, ":", hv_R, "(hv4dplusR),", hv_U, "(hv4dplusU)")
+print("hv4dplusU differs from hv4dplusR on", mismatches, "of 60 random inputs with ties")
+assert mismatches == 0
@@ -1,5 +1,6 @@
 import time
 from hv_plus import hv4dplusR, setup_cdllist, free_cdllist
+from point_io import load_any
 import random
 import numpy as np
 import matplotlib.pyplot as plt
@@ -11,12 +12,8 @@ def read_4d_points(n):
     if n in points_cache:
         return points_cache[n]
     else:
-        filename = f"tests/points_4d_{n}.txt"
-        data_points = []
-        with open(filename, 'r') as file:
-            for line in file:
-                point = list(map(float, line.strip().split()))
-                data_points.extend(point)
+        # tests/points_4d_{n}.bin is used if it exists (see point_io.py), otherwise the text file is parsed
+        data_points = load_any(f"tests/points_4d_{n}.txt")
         points_cache[n] = data_points
         return data_points  
 
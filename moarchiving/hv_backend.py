@@ -0,0 +1,138 @@
+import ctypes
+import os
+import subprocess
+import sys
+import numpy as np
+import hv_plus
+import hvc
+
+"""
+Optional compiled backend: the original C code of hvc.c (related/HVC-master) built as a shared library
+and called through ctypes. The functions of this module take NumPy arrays and use the library if it has
+been built (build_library) and fall back to the Python engines in hv_plus.py and hvc.py otherwise.
+The arrays are passed to the library by pointer and ctypes releases the GIL during the calls, so other
+threads keep running while the C code computes the hypervolume.
+"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCES_DIR = os.path.join(HERE, '..', 'related', 'HVC-master')
+SOURCES = ['hvc.c', 'avl.c']
+if sys.platform == 'win32':
+    LIBRARY = os.path.join(HERE, '_hvc.dll')
+elif sys.platform == 'darwin':
+    LIBRARY = os.path.join(HERE, '_hvc.dylib')
+else:
+    LIBRARY = os.path.join(HERE, '_hvc.so')
+
+_library = None
+_loaded = False
+
+_double_p = ctypes.POINTER(ctypes.c_double)
+
+
+"""Compiles hvc.c and avl.c into the shared library (the compiler is taken from CC, cc by default)"""
+def build_library(compiler=None, output=LIBRARY):
+    global _library, _loaded
+    compiler = compiler or os.environ.get('CC', 'cc')
+    sources = [os.path.join(SOURCES_DIR, s) for s in SOURCES]
+    subprocess.run([compiler, '-O2', '-shared', '-fPIC', '-o', output] + sources, check=True)
+    _library, _loaded = None, False  # loaded again on the next call
+    return output
+
+
+"""Returns the shared library (None if it has not been built or cannot be loaded)"""
+def load_library(path=LIBRARY):
+    global _library, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            library = ctypes.CDLL(path)
+        except OSError:
+            library = None
+        if library is not None:
+            # double hvc(double *data, int d, int n, double *ref, double *contribs, int recompute)
+            library.hvc.argtypes = [_double_p, ctypes.c_int, ctypes.c_int, _double_p, _double_p, ctypes.c_int]
+            library.hvc.restype = ctypes.c_double
+        _library = library
+    return _library
+
+
+def backend():
+    # Name of the backend that is used ('c' or 'python')
+    return 'c' if load_library() is not None else 'python'
+
+
+def _inside(points, ref, d):
+    points = np.asarray(points, dtype=float).reshape(-1, d)
+    ref = np.asarray(ref[:d], dtype=float)
+    mask = np.all(points < ref, axis=1)
+    return points, ref, mask
+
+
+def _c_hvc(points, ref):
+    # Hypervolume and contributions computed by hvc (HVC3D in 3-D, HVC4D-R in 4-D)
+    library = load_library()
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    ref = np.ascontiguousarray(ref, dtype=np.float64)
+    n, d = points.shape
+    contributions = np.zeros(n)
+    hv = library.hvc(points.ctypes.data_as(_double_p), d, n, ref.ctypes.data_as(_double_p),
+                     contributions.ctypes.data_as(_double_p), 1)
+    return hv, contributions
+
+
+"""Hypervolume of the 3-D points (an (n, 3) array) with respect to ref"""
+def hv3dplus(points, ref):
+    points, ref, mask = _inside(points, ref, 3)
+    points = points[mask]
+    if len(points) == 0:
+        return 0
+    if load_library() is not None:
+        return _c_hvc(points, ref)[0]
+    head = hv_plus.setup_cdllist_points(points, ref)
+    hv_plus.preprocessing(head, 3)
+    hv = hv_plus.hv3dplus(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+
+"""Hypervolume of the 4-D points (an (n, 4) array) with respect to ref"""
+def hv4dplus(points, ref):
+    points, ref, mask = _inside(points, ref, 4)
+    points = points[mask]
+    if len(points) == 0:
+        return 0
+    if load_library() is not None:
+        return _c_hvc(points, ref)[0]
+    head = hv_plus.setup_cdllist_points(points, ref)
+    hv = hv_plus.hv4dplusU(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+
+"""
+Hypervolume contributions of the 3-D or 4-D points (see hvc3d and hvc4d in hvc.py), in the input order.
+Points that do not strictly dominate ref have contribution 0. In 4-D the contributions are exact, while
+in 3-D (both hvc.c and hvc3d) dominated points are ignored by default, so the contribution of a point
+that is the only dominator of another point is too large. If consider_dominated is True, the exact 3-D
+contributions are computed with hvc3d in Python, also when the library has been built.
+"""
+def contributions(points, ref, consider_dominated=False):
+    points = np.asarray(points, dtype=float)
+    points, ref, mask = _inside(points, ref, points.shape[1])
+    result = np.zeros(len(points))
+    if mask.any():
+        if consider_dominated and points.shape[1] == 3:
+            result[mask] = hvc.hvc3d(points[mask], ref, consider_dominated=True)
+        elif load_library() is not None:
+            result[mask] = _c_hvc(points[mask], ref)[1]
+        elif points.shape[1] == 3:
+            result[mask] = hvc.hvc3d(points[mask], ref)
+        else:
+            result[mask] = hvc.hvc4d(points[mask], ref)
+    return result
+
+
+if __name__ == '__main__':
+    # python hv_backend.py builds the shared library next to this file
+    print("Built", build_library())
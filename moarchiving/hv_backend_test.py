@@ -0,0 +1,40 @@
+import numpy as np
+import hv_plus
+import hv_backend
+
+"""
+Examples for the optional compiled backend (hv_backend.py).
+The library is built first with "python hv_backend.py" (requires a C compiler); without it, the
+functions of hv_backend fall back to the Python engines and give the same results.
+"""
+
+print("Backend:", hv_backend.backend())
+
+print('Example for hv3dplus - points are the same as in test.inp')
+points = np.array([
+    [0.16, 0.86, 0.47],
+    [0.66, 0.37, 0.29],
+    [0.79, 0.79, 0.04],
+    [0.28, 0.99, 0.29],
+    [0.51, 0.37, 0.38],
+    [0.92, 0.62, 0.07],
+    [0.16, 0.53, 0.70],
+    [0.01, 0.98, 0.94],
+    [0.67, 0.17, 0.54],
+    [0.79, 0.72, 0.05]
+])
+ref = [1, 1, 1]
+print("Hypervolume (hv_backend):", hv_backend.hv3dplus(points, ref))
+head = hv_plus.setup_cdllist_points(points, ref)
+hv_plus.preprocessing(head, 3)
+print("Hypervolume (hv_plus):", hv_plus.hv3dplus(head))
+print("Contributions (hv_backend):", hv_backend.contributions(points, ref))
+print("\n")
+
+print('Example for hv4dplus - random points')
+np.random.seed(10)
+points = np.random.rand(500, 4)
+ref = [1, 1, 1, 1]
+print("Hypervolume (hv_backend):", hv_backend.hv4dplus(points, ref))
+head = hv_plus.setup_cdllist_points(points, ref)
+print("Hypervolume (hv_plus):", hv_plus.hv4dplusU(head))
@@ -0,0 +1,36 @@
+import numpy as np
+import hv_plus
+
+"""
+Examples for hv_improvement_batch (hv_plus.py).
+The improvements are compared to the ones computed with one_contribution_3d, one candidate at a time.
+"""
+
+print('Example for hv_improvement_batch - the front consists of the points from test.inp')
+front = np.array([
+    [0.16, 0.86, 0.47],
+    [0.66, 0.37, 0.29],
+    [0.79, 0.79, 0.04],
+    [0.28, 0.99, 0.29],
+    [0.51, 0.37, 0.38],
+    [0.92, 0.62, 0.07],
+    [0.16, 0.53, 0.70],
+    [0.01, 0.98, 0.94],
+    [0.67, 0.17, 0.54],
+    [0.79, 0.72, 0.05]
+])
+ref = [1, 1, 1]
+
+np.random.seed(4)
+candidates = np.random.rand(8, 3)
+improvements = hv_plus.hv_improvement_batch(front, candidates, ref)
+print("Improvements (hv_improvement_batch):", improvements)
+
+head = hv_plus.setup_cdllist_points(front, ref)
+hv_plus.preprocessing(head, 3)
+one_contributions = []
+for candidate in candidates:
+    new = hv_plus.DLNode(list(candidate) + [0.0])
+    hv_plus.clear_point(head, new)
+    one_contributions.append(hv_plus.one_contribution_3d(head, new))
+print("Improvements (one_contribution_3d):", np.array(one_contributions))
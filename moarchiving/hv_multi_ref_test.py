@@ -0,0 +1,46 @@
+import numpy as np
+import hv_plus
+
+"""
+Examples for hv_multi_ref and hv_threshold_curve (hv_plus.py).
+The hypervolumes are compared to the ones computed with hv3dplus/hv4dplusR, one reference point at a time.
+"""
+
+def hv_single_ref(points, ref):
+    points = points[np.all(points < ref, axis=1)]
+    head = hv_plus.setup_cdllist_points(points, ref)
+    if points.shape[1] == 3:
+        hv_plus.preprocessing(head, 3)
+        hv = hv_plus.hv3dplus(head)
+    else:
+        hv = hv_plus.hv4dplusR(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+print('Example for hv_multi_ref - a grid of reference points in 3-D')
+np.random.seed(5)
+points = np.random.rand(100, 3)
+points = points / np.linalg.norm(points, axis=1)[:, None]
+grid = np.linspace(0.8, 1.2, 3)
+refs = np.array(np.meshgrid(grid, grid, grid)).reshape(3, -1).T
+hvs = hv_plus.hv_multi_ref(points, refs)
+for ref, hv in zip(refs[:5], hvs[:5]):
+    print("Reference point:", ref, "hypervolume:", hv, "(hv_multi_ref),", hv_single_ref(points, ref), "(hv3dplus)")
+print("\n")
+
+print('Example for hv_multi_ref - a grid of reference points in 4-D (one sweep in w for all of them)')
+points = np.random.rand(100, 4)
+points = points / np.linalg.norm(points, axis=1)[:, None]
+refs = np.array(np.meshgrid(grid, grid, grid, grid)).reshape(4, -1).T
+hvs = hv_plus.hv_multi_ref(points, refs)
+for ref, hv in zip(refs[::20], hvs[::20]):
+    print("Reference point:", ref, "hypervolume:", hv, "(hv_multi_ref),", hv_single_ref(points, ref), "(hv4dplusR)")
+print("\n")
+
+print('Example for hv_threshold_curve - hypervolume versus the last coordinate of the reference point in 4-D')
+points = np.random.rand(100, 4)
+points = points / np.linalg.norm(points, axis=1)[:, None]
+thresholds = np.linspace(0.2, 1.1, 6)
+curve = hv_plus.hv_threshold_curve(points, [1.1, 1.1, 1.1], thresholds)
+for t, hv in zip(thresholds, curve):
+    print("Threshold:", t, "hypervolume:", hv, "(hv_threshold_curve),", hv_single_ref(points, [1.1, 1.1, 1.1, t]), "(hv4dplusR)")
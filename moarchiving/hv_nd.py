@@ -0,0 +1,107 @@
+import numpy as np
+import hv_plus
+
+"""
+Hypervolume of points in d >= 5 dimensions (minimization), computed with the WFG algorithm down to
+4-D subproblems, which are computed with hv4dplusU (hv_plus.py). The points are sorted by the last
+objective, so that the exclusive contribution of each point with respect to the points before it is its
+(d-1)-D box minus the (d-1)-D hypervolume of the limit set (the points before it, limited to its box),
+times its height in the last objective. The limit sets are filtered to their nondominated points
+before the recursion.
+"""
+
+# limit sets of up to this many points are computed by inclusion-exclusion
+_SMALL = 2
+
+
+"""
+Returns the mask of the points (an (n, d) array) that are not weakly dominated by another point, of
+equal points only the first one in lexicographic order is kept (see hv_plus.nondominated, which is used
+for d = 3 and 4). For d >= 5 the points are sorted by the sum of their coordinates, so that a point can
+only be dominated by one before it, and compared with the nondominated points found so far.
+"""
+def nondominated_nd(points):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    if d in (3, 4):
+        return hv_plus.nondominated(points)
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    order = np.lexsort(points.T[::-1])  # ties of the sum are in lexicographic order
+    order = order[np.argsort(points[order].sum(axis=1), kind='stable')]
+    kept = np.empty((n, d))
+    m = 0
+    for i in order.tolist():
+        p = points[i]
+        if m == 0 or not np.any(np.all(kept[:m] <= p, axis=1)):
+            kept[m] = p
+            m += 1
+            mask[i] = True
+    return mask
+
+
+def _order_objectives(points):
+    # The objective with the most distinct values is swept last (the objectives with few distinct
+    # values, e.g. integer objectives, are left to the lower dimensions), otherwise the order is kept
+    distinct = [len(np.unique(points[:, j])) for j in range(points.shape[1])]
+    return np.argsort(distinct, kind='stable')
+
+
+def _hv_small(points, ref):
+    # Hypervolume of one or two points by inclusion-exclusion
+    hv = np.prod(ref - points, axis=1).sum()
+    if len(points) == 2:
+        hv -= np.prod(ref - np.maximum(points[0], points[1]))
+    return float(hv)
+
+
+def _hv_front(points, ref):
+    # Hypervolume of the mutually nondominated points (an (n, d) array with d >= 4, all inside ref)
+    n, d = points.shape
+    if n <= _SMALL:
+        return _hv_small(points, ref)
+    if d == 4:
+        head = hv_plus.setup_cdllist_points(points, ref)
+        hv = hv_plus.hv4dplusU(head)
+        hv_plus.free_cdllist(head)
+        return hv
+
+    order = _order_objectives(points)
+    points, ref = points[:, order], ref[order]
+    points = points[hv_plus.lexsort_points(points)]
+    hv = 0
+    for i in range(n):
+        p = points[i]
+        contribution = np.prod(ref[:-1] - p[:-1])
+        if i > 0:
+            limit = np.maximum(points[:i, :-1], p[:-1])
+            limit = limit[nondominated_nd(limit)]
+            contribution -= _hv_front(limit, ref[:-1])
+        hv += contribution * (ref[-1] - p[-1])
+    return hv
+
+
+"""
+Computes the hypervolume of the points (an (n, d) array, d >= 3) with respect to ref. The points that
+do not strictly dominate ref and the dominated points are removed first, 3-D points are computed with
+hv3dplus, 4-D points with hv4dplusU and points with more objectives with the WFG recursion above.
+"""
+def hv_nd(points, ref):
+    points = np.asarray(points, dtype=float)
+    ref = np.asarray(ref, dtype=float)
+    d = len(ref)
+    if d < 3:
+        raise ValueError(f"hv_nd is implemented for 3 or more objectives, not {d}")
+    points = points.reshape(-1, d)
+    points = points[np.all(points < ref, axis=1)]
+    if len(points) == 0:
+        return 0
+    points = points[nondominated_nd(points)]
+    if d == 3:
+        head = hv_plus.setup_cdllist_points(points, ref)
+        hv_plus.preprocessing(head, 3)
+        hv = hv_plus.hv3dplus(head)
+        hv_plus.free_cdllist(head)
+        return hv
+    return _hv_front(points, ref)
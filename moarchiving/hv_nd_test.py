@@ -0,0 +1,60 @@
+import time
+import numpy as np
+import hv_nd
+import hv_plus
+
+"""
+Examples for hv_nd (hv_nd.py).
+In 4-D the result is compared to hv4dplusU, in 5-D and 6-D to the hypervolume of a few points
+computed by inclusion-exclusion and to a slicing of the points in the last objective.
+"""
+
+def hv_inclusion_exclusion(points, ref):
+    # sum over all nonempty subsets of (-1)^(k+1) times the volume of their intersection
+    n = len(points)
+    hv = 0
+    for subset in range(1, 1 << n):
+        members = [i for i in range(n) if subset >> i & 1]
+        hv += (-1) ** (len(members) + 1) * np.prod(ref - points[members].max(axis=0))
+    return hv
+
+def hv_slicing(points, ref):
+    # hypervolume of the slices between consecutive values of the last objective, down to hv4dplusU
+    points = points[np.argsort(points[:, -1])]
+    levels = np.append(points[:, -1], ref[-1])
+    hv = 0
+    for i in range(len(points)):
+        lower = points[:i + 1, :-1]
+        if lower.shape[1] == 4:
+            head = hv_plus.setup_cdllist_points(lower, ref[:-1], nondominated_only=True)
+            hv_slice = hv_plus.hv4dplusU(head)
+            hv_plus.free_cdllist(head)
+        else:
+            hv_slice = hv_slicing(lower, ref[:-1])
+        hv += hv_slice * (levels[i + 1] - levels[i])
+    return hv
+
+print('Example for hv_nd - 4-D points (computed by hv4dplusU)')
+np.random.seed(5)
+points = np.random.rand(200, 4)
+ref = np.ones(4)
+head = hv_plus.setup_cdllist_points(points, ref, nondominated_only=True)
+print("Hypervolume:", hv_nd.hv_nd(points, ref), "(hv_nd),", hv_plus.hv4dplusU(head), "(hv4dplusU)")
+print("\n")
+
+print('Example for hv_nd - a few 5-D and 6-D points')
+for d in [5, 6]:
+    points = np.random.rand(8, d)
+    ref = np.ones(d)
+    print(f"{d}-D hypervolume:", hv_nd.hv_nd(points, ref), "(hv_nd),", hv_inclusion_exclusion(points, ref), "(inclusion-exclusion)")
+print("\n")
+
+print('Example for hv_nd - points on a 5-D and a 6-D sphere')
+for d, n in [(5, 100), (6, 30)]:
+    points = np.abs(np.random.randn(n, d))
+    points = points / np.linalg.norm(points, axis=1)[:, None]
+    ref = np.full(d, 1.1)
+    tic = time.perf_counter()
+    hv = hv_nd.hv_nd(points, ref)
+    toc = time.perf_counter()
+    print(f"{d}-D hypervolume:", hv, "(hv_nd, time:", toc - tic, "),", hv_slicing(points, ref), "(slicing)")
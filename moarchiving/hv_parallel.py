@@ -0,0 +1,240 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import hv_nd
+import hv_plus
+
+"""
+Parallel versions of the hypervolume engines (process based, so that the Python code runs on
+several cores). The points are sent to each worker process once, when the pool is started.
+"""
+
+# points and reference point of the current pool, set in each worker by _init_worker
+_points = None
+_ref = None
+
+
+def _init_worker(points, ref):
+    global _points, _ref
+    _points = points
+    _ref = ref
+
+
+# shared memory block, offsets and reference points of the point sets of hv_many, set in each worker
+_shared = None
+_offsets = None
+_refs = None
+
+
+def _init_many_worker(name, shape, offsets, refs):
+    global _shared, _points, _offsets, _refs
+    _shared = shared_memory.SharedMemory(name=name)
+    _points = np.ndarray(shape, dtype=np.float64, buffer=_shared.buf)
+    _offsets = offsets
+    _refs = refs
+
+
+"""
+Volumes (3-D hypervolume times height) of the w-slices start, ..., stop - 1 of the points sorted
+by w, as computed by hv4dplusR. The list sorted by z is set up with the points below start first.
+"""
+def hv4d_slices(points, ref, start, stop):
+    head = hv_plus.setup_cdllist_points(points, ref)
+    p = head.next[3].next[3]
+    for _ in range(start):
+        p = p.next[3]
+    hv_plus.setup_z_below(head, p)
+
+    volumes = np.zeros(stop - start)
+    for i in range(stop - start):
+        hv_plus.setup_z_and_closest(head, p)
+        hv_plus.add_to_z(p)
+        hv_plus.update_links(head, p, p.next[2])
+        volumes[i] = hv_plus.hv3dplus(head) * (p.next[3].x[3] - p.x[3])
+        p = p.next[3]
+    hv_plus.free_cdllist(head)
+    return volumes
+
+
+def _hv4d_slices_task(bounds):
+    return hv4d_slices(_points, _ref, *bounds)
+
+
+def _balanced_bounds(n, chunks):
+    # The cost of a slice grows with the number of points below it, so the boundaries are chosen
+    # such that each chunk has about the same sum of prefix sizes (n * sqrt(k / chunks))
+    bounds = np.unique(np.round(n * np.sqrt(np.arange(chunks + 1) / chunks)).astype(int))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+"""
+Computes the hypervolume of the 4-D points (an (n, 4) array) as hv4dplusR, with the w-slices split
+into contiguous chunks that are computed by workers processes (os.cpu_count() by default). The
+volumes of the slices are added up in order of w, in the same way as in hv4dplusR, so that the
+result is the same for any number of workers.
+"""
+def hv4dplusR_parallel(points, ref, workers=None, chunks=None):
+    points = np.asarray(points, dtype=float).reshape(-1, 4)
+    ref = [float(r) for r in ref[:4]]
+    points = points[np.all(points < ref, axis=1)]
+    points = points[hv_plus.lexsort_points(points)]
+    n = len(points)
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or 4 * workers
+    bounds = _balanced_bounds(n, min(chunks, n)) if n > 0 else []
+
+    if workers == 1 or len(bounds) <= 1:
+        parts = [hv4d_slices(points, ref, start, stop) for start, stop in bounds]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(points, ref)) as executor:
+            parts = list(executor.map(_hv4d_slices_task, bounds))
+
+    hv = 0
+    for volumes in parts:
+        for volume in volumes.tolist():
+            hv += volume
+    return hv
+
+
+"""Hypervolume of the points (an (n, d) array) with respect to ref (hv3dplus, hv4dplusR or hv_nd for d >= 5)"""
+def hv_single(points, ref):
+    d = points.shape[1]
+    if d > 4:
+        return hv_nd.hv_nd(points, ref)
+    points = points[np.all(points < ref, axis=1)]
+    if len(points) == 0:
+        return 0
+    head = hv_plus.setup_cdllist_points(points, ref)
+    if d == 3:
+        hv_plus.preprocessing(head, 3)
+        hv = hv_plus.hv3dplus(head)
+    else:
+        hv = hv_plus.hv4dplusR(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+
+def _hv_many_task(i):
+    return hv_single(_points[_offsets[i]:_offsets[i + 1]], _refs[i])
+
+
+"""
+Computes the hypervolume of each point set in point_sets (a list of (n_i, d) arrays, with the same
+d >= 3) with respect to refs (one reference point or one per point set) using workers processes
+(os.cpu_count() by default). The point sets are copied once into a single shared memory block, which
+the workers read without pickling the points of each task, and the largest point sets are computed
+first, so that the work is balanced. Returns an array with one hypervolume per point set.
+"""
+def hv_many(point_sets, refs, workers=None):
+    point_sets = [np.asarray(points, dtype=np.float64) for points in point_sets]
+    if not point_sets:
+        return np.zeros(0)
+    d = point_sets[0].shape[1]
+    if any(points.shape[1] != d for points in point_sets):
+        raise ValueError("all point sets must have the same number of objectives")
+    refs = np.array(np.broadcast_to(np.asarray(refs, dtype=float), (len(point_sets), d)))
+    sizes = np.array([len(points) for points in point_sets])
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    order = np.argsort(-sizes, kind='stable').tolist()  # largest first
+    workers = workers or os.cpu_count() or 1
+
+    hvs = np.zeros(len(point_sets))
+    if workers == 1:
+        for i in order:
+            hvs[i] = hv_single(point_sets[i], refs[i])
+        return hvs
+
+    shape = (int(offsets[-1]), d)
+    shared = shared_memory.SharedMemory(create=True, size=max(shape[0] * d * 8, 1))
+    try:
+        packed = np.ndarray(shape, dtype=np.float64, buffer=shared.buf)
+        for points, start in zip(point_sets, offsets[:-1]):
+            packed[start:start + len(points)] = points
+        with ProcessPoolExecutor(workers, initializer=_init_many_worker,
+                                 initargs=(shared.name, shape, offsets, refs)) as executor:
+            # small tasks are sent in batches, which keeps the largest-first order
+            chunksize = max(1, len(order) // (16 * workers))
+            for i, hv in zip(order, executor.map(_hv_many_task, order, chunksize=chunksize)):
+                hvs[i] = hv
+        del packed
+    finally:
+        shared.close()
+        shared.unlink()
+    return hvs
+
+
+def _staircase(points):
+    # Points that are nondominated in (x, y) (the first one of equal points), as an (m, 3) array
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    points = points[order]
+    lowest = np.minimum.accumulate(np.concatenate(([np.inf], points[:-1, 1])))
+    return points[points[:, 1] < lowest]
+
+
+"""
+Sweeps the slab start, ..., stop - 1 of the points sorted by z (an (n, 3) array), given the staircase
+in (x, y) of the points below start, and returns for each point of the slab the area it adds to the
+region of the (x,y)-plane dominated by the points below it, or None if it is dominated (the terms of
+sweep_3d). The points of the staircase are placed at z = -inf, so that they are swept
+before the points of the slab. The areas depend only on the (x, y) coordinates of the staircase, so they
+are the same numbers as in the sweep of hv3dplus over all points.
+"""
+def hv3d_slab(points, ref, start, stop, staircase):
+    below = staircase.copy()
+    below[:, 2] = -np.inf
+    head = hv_plus.setup_cdllist_points(np.concatenate((below, points[start:stop])), ref)
+    hv_plus.preprocessing(head, 3)
+    areas = [added for p, added in hv_plus.sweep_3d(head, yield_dominated=True)]
+    hv_plus.free_cdllist(head)
+    return areas[len(below):]
+
+
+def _hv3d_slab_task(task):
+    start, stop, staircase = task
+    return hv3d_slab(_points, _ref, start, stop, staircase)
+
+
+"""
+Computes the hypervolume of the 3-D points (an (n, 3) array) with the list sorted by z cut into
+contiguous slabs that are swept by workers processes (os.cpu_count() by default). Each worker gets
+the staircase in (x, y) of the points below its slab, which delimits the area dominated at the bottom
+of the slab, and returns the terms of its sweep (hv3d_slab). The staircases are set up one slab after
+the other with NumPy. The terms are added up point by point in the same way as in hv3dplus, so the result
+is the same as that of hv3dplus (bit for bit) for any number of workers.
+"""
+def hv3dplus_parallel(points, ref, workers=None, chunks=None):
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    ref = [float(r) for r in ref[:3]]
+    points = points[np.all(points < ref, axis=1)]
+    points = points[hv_plus.lexsort_points(points)]
+    n = len(points)
+    workers = workers or os.cpu_count() or 1
+    chunks = min(chunks or 4 * workers, n)
+    if n == 0:
+        return 0
+
+    bounds = np.unique(np.linspace(0, n, chunks + 1).astype(int))
+    tasks = []
+    staircase = np.empty((0, 3))
+    for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        tasks.append((start, stop, staircase))
+        staircase = _staircase(np.concatenate((staircase, points[start:stop])))
+
+    if workers == 1 or len(tasks) == 1:
+        parts = [hv3d_slab(points, ref, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(points, ref)) as executor:
+            parts = list(executor.map(_hv3d_slab_task, tasks))
+
+    levels = points[:, 2].tolist() + [ref[2]]
+    area = 0
+    volume = 0
+    i = 0
+    for areas in parts:
+        for added in areas:
+            if added is not None:
+                area += added
+            volume += area * (levels[i + 1] - levels[i])
+            i += 1
+    return volume
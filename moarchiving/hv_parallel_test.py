@@ -0,0 +1,55 @@
+import time
+import numpy as np
+import hv_plus
+import hv_parallel
+
+"""
+Examples for the parallel engines (hv_parallel.py).
+The hypervolumes are compared to the ones computed by the serial engines.
+"""
+
+if __name__ == '__main__':
+    print('Example for hv4dplusR_parallel - random points on a sphere')
+    np.random.seed(11)
+    points = np.random.rand(1000, 4)
+    points = points / np.linalg.norm(points, axis=1)[:, None]
+    ref = [1.1, 1.1, 1.1, 1.1]
+
+    tic = time.perf_counter()
+    head = hv_plus.setup_cdllist_points(points, ref)
+    hv = hv_plus.hv4dplusR(head)
+    print("Hypervolume (hv4dplusR):", hv, "time:", time.perf_counter() - tic)
+    for workers in (1, 2, 4):
+        tic = time.perf_counter()
+        hv_workers = hv_parallel.hv4dplusR_parallel(points, ref, workers=workers)
+        print(f"Hypervolume (hv4dplusR_parallel, {workers} workers):", hv_workers,
+              "equal:", hv_workers == hv, "time:", time.perf_counter() - tic)
+    print("\n")
+
+    print('Example for hv_many - many saved fronts of different sizes')
+    fronts = [np.random.rand(np.random.randint(20, 200), 3) for _ in range(500)]
+    tic = time.perf_counter()
+    hvs = hv_parallel.hv_many(fronts, [1, 1, 1], workers=2)
+    print("Hypervolumes of the first fronts (hv_many):", hvs[:3], "time:", time.perf_counter() - tic)
+    print("Hypervolumes of the first fronts (hv3dplus):", [hv_parallel.hv_single(front, [1, 1, 1]) for front in fronts[:3]])
+    print("\n")
+
+    print('Example for hv3dplus_parallel - a large front on a sphere')
+    points = np.random.rand(100000, 3)
+    points = points / np.linalg.norm(points, axis=1)[:, None]
+    ref = [1.1, 1.1, 1.1]
+    tic = time.perf_counter()
+    hv = hv_parallel.hv_single(points, ref)
+    print("Hypervolume (hv3dplus):", hv, "time:", time.perf_counter() - tic)
+    for workers in (1, 2, 4):
+        tic = time.perf_counter()
+        hv_workers = hv_parallel.hv3dplus_parallel(points, ref, workers=workers, chunks=8)
+        print(f"Hypervolume (hv3dplus_parallel, {workers} workers):", hv_workers,
+              "equal:", hv_workers == hv, "time:", time.perf_counter() - tic)
+
+    print('Example for hv3dplus_parallel - integer points with ties, any number of slabs gives the same result as hv3dplus')
+    points = np.random.randint(0, 10, (2000, 3)).astype(float)
+    ref = [10, 10, 10]
+    hv = hv_parallel.hv_single(points, ref)
+    print("All equal to hv3dplus:", all(hv_parallel.hv3dplus_parallel(points, ref, workers=1, chunks=chunks) == hv
+                                        for chunks in (1, 2, 3, 7, 50, 2000)))
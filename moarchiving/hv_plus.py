@@ -1,4 +1,10 @@
-from functools import cmp_to_key
+from bisect import bisect_right
+from functools import cmp_to_key, partial
+from collections import deque
+from itertools import repeat
+from operator import attrgetter, setitem
+import threading
+import time
 import numpy as np
 
 """
@@ -16,6 +22,8 @@ def lexicographic_less_4d(a, b):
 # ------------------- Data Structure ------------------------
 
 class DLNode:
+    __slots__ = ('x', 'closest', 'cnext', 'next', 'prev', 'ndomr', 'block')
+
     def __init__(self, x=None):
         self.x = x if x else [None, None, None, None]
         self.closest = [None, None]  # closest in x coordinate, closest in y coordinate
@@ -23,6 +31,54 @@ class DLNode:
         self.next = [None, None, None, None]
         self.prev = [None, None, None, None]
         self.ndomr = 0  # number of dominators
+        self.block = None  # all nodes of the list (only set for the head returned by setup_cdllist)
+
+
+def _clear_links(nodes):
+    # Sets the links of the nodes to None, in place (new lists would make the garbage collector run)
+    everything = slice(None)
+    for field, size in (('next', 4), ('prev', 4), ('closest', 2), ('cnext', 2)):
+        deque(map(setitem, map(attrgetter(field), nodes), repeat(everything), repeat((None,) * size)), maxlen=0)
+
+
+"""
+Pool of reusable nodes. setup_cdllist draws the nodes from the pool and free_cdllist returns them,
+so that repeated hypervolume computations of similar size do not allocate new nodes.
+At most max_size nodes are kept, the nodes of larger lists are left to the garbage collector. The links
+of the nodes that are kept are cleared, so that they do not keep the other nodes of the freed list alive.
+acquire and release take a lock, so lists can be set up and freed in several threads (each list
+must only be used by one thread).
+"""
+class NodePool:
+    def __init__(self, max_size=1 << 17):
+        self.nodes = []
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def acquire(self, m):
+        # Returns a list of m nodes, new nodes are created only if the pool is empty
+        with self.lock:
+            nodes = self.nodes
+            k = max(len(nodes) - m, 0)
+            block = nodes[k:]
+            del nodes[k:]
+        block.extend(DLNode() for _ in range(m - len(block)))
+        return block
+
+    def release(self, block):
+        with self.lock:
+            kept = block[:max(self.max_size - len(self.nodes), 0)]
+            self.nodes.extend(kept)
+        _clear_links(kept)
+
+    def clear(self):
+        with self.lock:
+            self.nodes.clear()
+
+node_pool = NodePool()
+
+# Statistics of the engines (an hv_stats.EngineStats), counted only while it is set (see hv_stats.collect_stats)
+stats = None
 
 # ----------------------------- Data Structure Functions -----------------------------------------
 
@@ -73,33 +129,45 @@ def init_sentinels(ref, d):
 def init_sentinels_new(list_nodes, ref, d):
     s1, s2, s3 = list_nodes[0], list_nodes[1], list_nodes[2]
 
+    # The fields are overwritten in place, so that the nodes can be reused (see NodePool)
     # Initialize s1 node
-    s1.x = [float('-inf'), ref[1], float('-inf'), float('-inf')]
-    s1.closest = [s2, s1]
-    s1.next = [None, None, s2, s2]
-    s1.cnext = [None, None]
-    s1.prev = [None, None, s3, s3]
+    s1.x[:] = [float('-inf'), ref[1], float('-inf'), float('-inf')]
+    s1.closest[:] = [s2, s1]
+    s1.next[:] = [None, None, s2, s2]
+    s1.cnext[:] = [None, None]
+    s1.prev[:] = [None, None, s3, s3]
     s1.ndomr = 0
 
     # Initialize s2 node
-    s2.x = [ref[0], float('-inf'), float('-inf'), float('-inf')]
-    s2.closest = [s2, s1]
-    s2.next = [None, None, s3, s3]
-    s2.cnext = [None, None]
-    s2.prev = [None, None, s1, s1]
+    s2.x[:] = [ref[0], float('-inf'), float('-inf'), float('-inf')]
+    s2.closest[:] = [s2, s1]
+    s2.next[:] = [None, None, s3, s3]
+    s2.cnext[:] = [None, None]
+    s2.prev[:] = [None, None, s1, s1]
     s2.ndomr = 0
 
     # Initialize s3 node
-    s3.x = [float('-inf'), float('-inf'), ref[2], ref[3] if d == 4 else float('-inf')]
-    s3.closest = [s2, s1]
-    s3.next = [None, None, s1, None]
-    s3.cnext = [None, None]
-    s3.prev = [None, None, s2, s2]
+    s3.x[:] = [float('-inf'), float('-inf'), ref[2], ref[3] if d == 4 else float('-inf')]
+    s3.closest[:] = [s2, s1]
+    s3.next[:] = [None, None, s1, None]
+    s3.cnext[:] = [None, None]
+    s3.prev[:] = [None, None, s2, s2]
     s3.ndomr = 0
 
     return s1
 
 
+def update_sentinels(head, ref, d):
+    # Moves the reference point of an existing list to ref, in place. The links are still valid
+    # as long as all points in the list strictly dominate the new reference point.
+    s1, s2, s3 = head, head.next[2], head.prev[2]
+    s1.x[1] = ref[1]
+    s2.x[0] = ref[0]
+    s3.x[2] = ref[2]
+    if d == 4:
+        s3.x[3] = ref[3]
+
+
 # --------------------------------------------------------------
 
 def clear_point(head, p):
@@ -128,6 +196,8 @@ def add_to_z(new):
 def remove_from_z(old):
     old.prev[2].next[2] = old.next[2]
     old.next[2].prev[2] = old.prev[2]
+    if stats is not None:
+        stats.removed_from_z += 1
 
 
 def setup_z_and_closest(head, new):
@@ -159,6 +229,18 @@ def update_links(head, new, p):
     ndom = 0
     all_delimiters_visited = False
 
+    if stats is not None:
+        # the walk below stops at the same node, as removing points from z does not change their next[2]
+        visited = 0
+        q = p
+        while q != stop:
+            visited += 1
+            if q.x[0] <= new.x[0] and q.x[1] <= new.x[1] and (q.x[0] < new.x[0] or q.x[1] < new.x[1]):
+                break
+            q = q.next[2]
+        stats.update_links_calls += 1
+        stats.update_links_visited += visited
+
     while p != stop and not all_delimiters_visited:
         if p.x[0] <= new.x[0] and p.x[1] <= new.x[1] and (p.x[0] < new.x[0] or p.x[1] < new.x[1]):
             all_delimiters_visited = True
@@ -227,46 +309,170 @@ def print_cdllist(head, di):
         current = current.next[di] if current.next[di] != head else None
 
 
-"""Sets up a circular doubly-linked list"""
-def setup_cdllist(data, n, d, ref):
-    head = [DLNode() for _ in range(n + 3)]
+"""
+Returns the permutation that sorts the rows of points (an (n, d) array) in ascending order of the last
+coordinate, ties are broken by the previous coordinates (same as np.lexsort(points.T)).
+Since ties in the last coordinate are rare, a single argsort is tried first (without ties, the order
+does not depend on the stability of the sort).
+"""
+def lexsort_points(points):
+    order = np.argsort(points[:, -1])
+    last = points[order, -1]
+    if np.any(last[1:] == last[:-1]):
+        order = np.lexsort(points.T)
+    return order
+
+# staircases of _staircase_sweep with more points are kept in a SortedList
+_STAIRS_LIST_MAX = 1 << 10
+
+def _staircase_sweep(xs, ys, insert, query):
+    # Sweeps the items (already sorted by the last coordinate) with the staircase of the inserted items
+    # in (x, y), kept as a sorted list of (y, x) (decreasing in x) between two sentinels.
+    # Returns the mask of the queried items that are (weakly) dominated by an item inserted before them.
+    # An inserted item that is dominated is not added to the staircase.
+    # A long staircase is moved to a SortedList (as the tree of preprocessing), so that each item is
+    # inserted in O(log n) time instead of O(n), and the sweep takes O(n log n) time.
+    inf = float('inf')
+    stairs = [(-inf, inf), (inf, -inf)]
+    bisect = partial(bisect_right, stairs)
+    is_list = True
+    dominated = [False] * len(xs)
+    for i, (x, y, ins, qry) in enumerate(zip(xs, ys, insert, query)):
+        j = bisect((y, x))
+        if stairs[j - 1][1] <= x:
+            dominated[i] = qry
+            continue
+        if ins:
+            k = j
+            while stairs[k][1] >= x:
+                k += 1
+            if is_list:
+                stairs[j:k] = [(y, x)]
+                if len(stairs) > _STAIRS_LIST_MAX:
+                    stairs = SortedList(stairs)
+                    bisect = stairs.bisect_right
+                    is_list = False
+            else:
+                del stairs[j:k]
+                stairs.add((y, x))
+    return np.array(dominated, dtype=bool)
+
+
+def _nondominated_4d(points, index):
+    # Indices (into points) of the nondominated points among points[index], which are sorted in
+    # lexicographic order (w, z, y, x). The points of the upper half cannot dominate the ones of the
+    # lower half (but for equal points, and the first one is kept), so each half is filtered on its own
+    # and then the upper half is filtered by the lower one with a sweep in z.
+    if len(index) <= 64:
+        # small sets are compared pairwise: a point is dominated by one before it that is <= in all coordinates
+        p = points[index]
+        dominated = np.tril(np.all(p[:, None, :] >= p[None, :, :], axis=2), -1).any(axis=1)
+        return index[~dominated]
+    half = len(index) // 2
+    lower = _nondominated_4d(points, index[:half])
+    upper = _nondominated_4d(points, index[half:])
+    merged = np.concatenate((lower, upper))
+    is_upper = np.arange(len(merged)) >= len(lower)
+    order = np.lexsort((is_upper, points[merged, 0], points[merged, 1], points[merged, 2]))
+    dominated = np.zeros(len(merged), dtype=bool)
+    dominated[order] = _staircase_sweep(points[merged[order], 0].tolist(), points[merged[order], 1].tolist(),
+                                        (~is_upper[order]).tolist(), is_upper[order].tolist())
+    return np.concatenate((lower, upper[~dominated[len(lower):]]))
+
+
+"""
+Finds the nondominated points of an (n, 3) or (n, 4) array of points (minimization). Returns a boolean
+mask (or the indices, in ascending order, if return_indices is True) of the points that are not weakly
+dominated by another point; of several equal points only the first one in lexicographic order is kept.
+In 3-D, the points are swept in z with the staircase in (x, y) of the points seen so far (O(n log n)),
+in 4-D, the points sorted by w are split in two halves recursively and the upper half is filtered by
+the lower one with the same sweep (O(n log^2 n)).
+"""
+def nondominated(points, return_indices=False):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    if d not in (3, 4):
+        raise ValueError(f"nondominated is implemented for 3 or 4 objectives, not {d}")
+    order = lexsort_points(points)
+    if d == 3:
+        everything = [True] * n
+        dominated = _staircase_sweep(points[order, 0].tolist(), points[order, 1].tolist(), everything, everything)
+        index = order[~dominated]
+    else:
+        index = _nondominated_4d(points, order)
+    if return_indices:
+        return np.sort(index)
+    mask = np.zeros(n, dtype=bool)
+    mask[index] = True
+    return mask
+
+
+def _set_items(lists, i, values):
+    # Sets lists[k][i] = values[k] for all k (the loop runs in map, not in Python code)
+    deque(map(setitem, lists, repeat(i), values), maxlen=0)
+
+
+"""
+Sets up a circular doubly-linked list from an (n, d) array of points (d = 3 or 4).
+The nodes are taken from pool and are set up in bulk from the sorted array.
+If nondominated_only is True, the dominated points are removed first (see nondominated).
+Each field of the nodes is written in one map call, but still node by node, so on 100k points the
+setup takes about as long as hv3dplus.
+"""
+def setup_cdllist_points(points, ref, pool=node_pool, nondominated_only=False):
+    if stats is not None:
+        tic = time.perf_counter()
+    points = np.asarray(points, dtype=float)
+    if nondominated_only:
+        points = points[nondominated(points)]
+    n, d = points.shape
+    head = pool.acquire(n + 3)
     init_sentinels_new(head[0:3], ref, d) # init_sentinels_new accepts a list at the beginning, therefore we use head[0:3]
+    head[0].block = head
     di = d - 1
 
     if n > 0:
-        # Convert data to a structured format suitable for sorting and linking
-        points = np.array(data).reshape(n, d)
-        if d == 3:
-            # Using np.lexsort to sort by z, y, x in ascending order
-            sorted_indices = np.lexsort((points[:, 0], points[:, 1], points[:, 2]))
-        elif d == 4:
-            # Using np.lexsort to sort by w, z, y, x in ascending order
-            sorted_indices = np.lexsort((points[:, 0], points[:, 1], points[:, 2], points[:, 3]))
-        sorted_points = points[sorted_indices]
-
-        # Create nodes from sorted points
-        for i, index in enumerate(sorted_indices):
-            head[i + 3].x = points[index].tolist()
-            if d == 3: #
-                head[i + 3].x.append(0.0) # Add 0.0 for 3d points so that it matches the original code, written in C
-
-        # Link nodes
-        s = head[0].next[di]
-        s.next[di] = head[3]
-        head[3].prev[di] = s
-
-        for i in range(3, n+2):
-            head[i].next[di] = head[i+1] if i+1 < len(head) else head[0]
-            head[i+1].prev[di] = head[i]
-
-        s = head[0].prev[di]
-        s.prev[di] = head[n+2]
-        head[n+2].next[di] = s
+        nodes = head[3:]
+        sorted_points = points[lexsort_points(points)]
 
+        # Coordinates are copied into the x lists of the nodes row by row (zip reuses its tuple of values)
+        columns = [sorted_points[:, i].tolist() for i in range(d)]
+        if d == 3:
+            columns.append(repeat(0.0)) # x[3] is 0.0 for 3d points so that it matches the original code, written in C
+        everything = slice(None)
+        deque(map(setitem, map(attrgetter('x'), nodes), repeat(everything), zip(*columns)), maxlen=0)
+        deque(map(setattr, nodes, repeat('ndomr'), repeat(0, n)), maxlen=0)
+
+        # Reset closest and cnext as in point2struct
+        s1, s2 = head[0], head[1]
+        for field in ('closest', 'cnext'):
+            deque(map(setitem, map(attrgetter(field), nodes), repeat(everything), repeat((s2, s1), n)), maxlen=0)
+
+        # Link nodes: s2 -> nodes in sorted order -> s3
+        chain = [head[1]] + nodes + [head[2]]
+        _set_items(map(attrgetter('next'), chain[:-1]), di, chain[1:])
+        _set_items(map(attrgetter('prev'), chain[1:]), di, chain[:-1])
+
+    if stats is not None:
+        stats.add_phase('setup_cdllist_points', tic)
     return head[0]
 
-def free_cdllist(head):
-    del head
+
+"""Sets up a circular doubly-linked list from a flat list of n points in d dimensions"""
+def setup_cdllist(data, n, d, ref, pool=node_pool, nondominated_only=False):
+    return setup_cdllist_points(np.asarray(data).reshape(n, d), ref, pool, nondominated_only)
+
+"""
+Returns the nodes of the list to pool. The head is not returned and its links are cleared, so that
+a list that has been freed cannot be used by mistake (its nodes may already belong to another list).
+"""
+def free_cdllist(head, pool=node_pool):
+    block = head.block
+    if block is not None:
+        head.block = None
+        head.next[:] = head.prev[:] = [None, None, None, None]
+        head.closest[:] = head.cnext[:] = [None, None]
+        pool.release(block[1:])
 
 # ------------------------- Hyperovlume Indicator Algorithms ---------------------------------------
 def restart_list_y(head): 
@@ -280,6 +486,15 @@ def compute_area_simple(p, di, s, u):
     q = s
     area += (q.x[dj] - p[dj]) * (u.x[di] - p[di])
 
+    if stats is not None:
+        iterations = 0
+        v = u
+        while p[dj] < v.x[dj]:
+            iterations += 1
+            v = v.cnext[di]
+        stats.compute_area_calls += 1
+        stats.compute_area_iterations += iterations
+
     while p[dj] < u.x[dj]:
         q = u
         u = u.cnext[di]
@@ -300,18 +515,19 @@ def restart_base_setup_z_and_closest(head, new):
     restart_list_y(head)
 
     while p and lexicographic_less(p.x, newx):
-        p.cnext[0] = p.closest[0]
-        p.cnext[1] = p.closest[1]
+        if p.ndomr == 0:  # dominated points left in the list sorted by z (as in hvc.py) are skipped
+            p.cnext[0] = p.closest[0]
+            p.cnext[1] = p.closest[1]
 
-        p.cnext[0].cnext[1] = p
-        p.cnext[1].cnext[0] = p
+            p.cnext[0].cnext[1] = p
+            p.cnext[1].cnext[0] = p
 
-        if p.x[0] <= newx[0] and p.x[1] <= newx[1]:
-            new.ndomr += 1
-        elif p.x[1] < newx[1] and (p.x[0] < closest0.x[0] or (p.x[0] == closest0.x[0] and p.x[1] < closest0.x[1])):
-            closest0 = p
-        elif p.x[0] < newx[0] and (p.x[1] < closest1.x[1] or (p.x[1] == closest1.x[1] and p.x[0] < closest1.x[0])):
-            closest1 = p
+            if p.x[0] <= newx[0] and p.x[1] <= newx[1]:
+                new.ndomr += 1
+            elif p.x[1] < newx[1] and (p.x[0] < closest0.x[0] or (p.x[0] == closest0.x[0] and p.x[1] < closest0.x[1])):
+                closest0 = p
+            elif p.x[0] < newx[0] and (p.x[1] < closest1.x[1] or (p.x[1] == closest1.x[1] and p.x[0] < closest1.x[0])):
+                closest1 = p
 
         p = p.next[2]
 
@@ -337,79 +553,377 @@ def one_contribution_3d(head, new):
     volume = 0
 
     while p and (p.x[0] > new.x[0] or p.x[1] > new.x[1]):
-        volume += area * (p.x[2] - lastz)
-        p.cnext[0] = p.closest[0]
-        p.cnext[1] = p.closest[1]
-        
-        if p.x[0] >= new.x[0] and p.x[1] >= new.x[1]:
-            area -= compute_area_simple(p.x, 1, p.cnext[0], p.cnext[0].cnext[1])
-            p.cnext[1].cnext[0] = p
-            p.cnext[0].cnext[1] = p
-        elif p.x[0] >= new.x[0]:
-            if p.x[0] <= new.cnext[0].x[0]:
-                x = [p.x[0], new.x[1], p.x[2]]
-                area -= compute_area_simple(x, 1, new.cnext[0], new.cnext[0].cnext[1])
-                p.cnext[0] = new.cnext[0]
+        if p.ndomr < 1:  # dominated points are skipped
+            volume += area * (p.x[2] - lastz)
+            p.cnext[0] = p.closest[0]
+            p.cnext[1] = p.closest[1]
+
+            if p.x[0] >= new.x[0] and p.x[1] >= new.x[1]:
+                area -= compute_area_simple(p.x, 1, p.cnext[0], p.cnext[0].cnext[1])
                 p.cnext[1].cnext[0] = p
-                new.cnext[0] = p
-        else:
-            if p.x[1] <= new.cnext[1].x[1]:
-                x = [new.x[0], p.x[1], p.x[2]]
-                area -= compute_area_simple(x, 0, new.cnext[1], new.cnext[1].cnext[0])
-                p.cnext[1] = new.cnext[1]
                 p.cnext[0].cnext[1] = p
-                new.cnext[1] = p
-        
-        lastz = p.x[2]
+            elif p.x[0] >= new.x[0]:
+                if p.x[0] <= new.cnext[0].x[0]:
+                    x = [p.x[0], new.x[1], p.x[2]]
+                    area -= compute_area_simple(x, 1, new.cnext[0], new.cnext[0].cnext[1])
+                    p.cnext[0] = new.cnext[0]
+                    p.cnext[1].cnext[0] = p
+                    new.cnext[0] = p
+            else:
+                if p.x[1] <= new.cnext[1].x[1]:
+                    x = [new.x[0], p.x[1], p.x[2]]
+                    area -= compute_area_simple(x, 0, new.cnext[1], new.cnext[1].cnext[0])
+                    p.cnext[1] = new.cnext[1]
+                    p.cnext[0].cnext[1] = p
+                    new.cnext[1] = p
+
+            lastz = p.x[2]
         p = p.next[2]
     
     if p:
         volume += area * (p.x[2] - lastz)
     return volume
 
-"""Main function for computing the hypervolume in 3-D"""
-def hv3dplus(head):
-    p = head
-    area = 0
-    volume = 0
-
-    restart_list_y(head)
-    p = p.next[2].next[2]
-
-    stop = head.prev[2]
-
+"""
+Sweep in z of the points in the list, shared by hv3dplus and the functions built on its slices
+(hv_slices, dominated_boxes, nondominated_boxes). Yields each nondominated point p in the order of z
+together with measure(p.x, 1, s, u), where s and u delimit the area that p adds to the region of the
+(x,y)-plane dominated by the points below it (compute_area_simple returns this area, area_boxes the
+boxes it consists of). Dominated points are skipped and removed from the list sorted by z, unless
+remove_dominated is False, and are yielded with the term None if yield_dominated is True. The sweep runs
+from start (the staircase in (x,y) of the points below start must then be set up in cnext) to stop
+(head.prev[2] by default). Assumes that preprocessing has been called.
+"""
+def sweep_3d(head, measure=compute_area_simple, remove_dominated=True, start=None, stop=None, yield_dominated=False):
+    if start is None:
+        restart_list_y(head)
+        start = head.next[2].next[2]
+    if stop is None:
+        stop = head.prev[2]
+
+    p = start
     while p != stop:
         if p.ndomr < 1:
             p.cnext[0] = p.closest[0]
             p.cnext[1] = p.closest[1]
-
-            #print("Current p", (p.x if p!= None else None))
-            #print("p ndomr", p.ndomr)
-            #print("p.closest[0]", p.closest[0].x)
-            #print("p.closest[1]", p.closest[1].x)
-            #print("p.cnext[0].cnext[1]", p.cnext[0].cnext[1].x, "\n")
-
-            area += compute_area_simple(p.x, 1, p.cnext[0], p.cnext[0].cnext[1])
-            #print("Area:", area)
-
+            term = measure(p.x, 1, p.cnext[0], p.cnext[0].cnext[1])
             p.cnext[0].cnext[1] = p
             p.cnext[1].cnext[0] = p
+            yield p, term
         else:
-            remove_from_z(p)
+            if remove_dominated:
+                remove_from_z(p)
+            if yield_dominated:
+                yield p, None  # p.next[2] is still the next point in z
+        p = p.next[2]
 
-        #print(f"Contribution of {p.x} is {area * (p.next[2].x[2] - p.x[2])}")
-        volume += area * (p.next[2].x[2] - p.x[2])
-        #print("Volume:", volume)
 
-        p = p.next[2]
+"""
+Main function for computing the hypervolume in 3-D. Dominated points are removed from the list sorted
+by z, unless remove_dominated is False (they are then skipped, as in hvc.py).
+The volume is added up slice by slice between each point and the next one in z, dominated points included,
+as in hv-plus.c (this order of the sums is kept so that the results do not change).
+"""
+def hv3dplus(head, remove_dominated=True):
+    if stats is not None:
+        tic = time.perf_counter()
+    area = 0
+    volume = 0
 
+    for p, added in sweep_3d(head, compute_area_simple, remove_dominated, yield_dominated=True):
+        if added is not None:
+            area += added
+        volume += area * (p.next[2].x[2] - p.x[2])
+
+    if stats is not None:
+        stats.add_phase('hv3dplus', tic)
     return volume
 
+
+# ----------------------------------------------------------------
+
+def area_boxes(p, di, s, u):
+    # Same sweep as compute_area_simple(p, 1, s, u), but each term of the area is returned as a box
+    # (x1, x2, y1, y2, p[2]) instead of being added up
+    z = p[2]
+    boxes = [(p[0], s.x[0], p[1], u.x[1], z)]
+    while p[0] < u.x[0]:
+        q = u
+        u = u.cnext[1]
+        boxes.append((p[0], q.x[0], q.x[1], u.x[1], z))
+    return boxes
+
+
+def _sweep_boxes(head, remove_dominated=False):
+    # Boxes of all terms of the areas of the sweep in z
+    boxes = []
+    for p, terms in sweep_3d(head, area_boxes, remove_dominated):
+        boxes.extend(terms)
+    return boxes
+
+
+"""
+Decomposes the region of the reference box that is not dominated by the points in the list into
+disjoint boxes [x1, x2] x [y1, y2] x (-inf, z2] with a single sweep in z (as in hv3dplus).
+When a point p is reached in the sweep, the area it adds to the dominated region of the (x,y)-plane
+is not dominated for any z < p.x[2], which gives one box per term of the area of p. The rest
+(the area not dominated by any point) is not dominated up to ref[2].
+Returns an (m, 5) array with the columns x1, x2, y1, y2, z2 (the lower bounds may be -inf).
+Assumes that preprocessing has been called.
+"""
+def nondominated_boxes(head):
+    boxes = _sweep_boxes(head)
+
+    # All points of the final list in (x,y) are inner delimiters of (-inf, -inf)
+    s = head.next[2]
+    boxes.extend(area_boxes([float('-inf'), float('-inf'), head.prev[2].x[2]], 1, s, s.cnext[1]))
+    return np.array(boxes, dtype=float).reshape(-1, 5)
+
+
+"""
+Computes the hypervolume improvement of each candidate point (an (m, 3) array), i.e. the contribution
+of the candidate to the front (an (n, 3) array) with respect to ref, without changing the front.
+The front is swept once (nondominated_boxes) and each improvement is the volume of the part of
+the region dominated by the candidate that lies in the boxes not dominated by the front. The
+candidates are sorted by z once, so that each block of candidates only visits the boxes that end
+above its lowest z. Candidates that are dominated by the front have improvement 0.
+"""
+def hv_improvement_batch(front, candidates, ref, block_size=1 << 22):
+    front = np.asarray(front, dtype=float).reshape(-1, 3)
+    candidates = np.asarray(candidates, dtype=float).reshape(-1, 3)
+    ref = np.asarray(ref[:3], dtype=float)
+    front = front[np.all(front < ref, axis=1)]
+
+    head = setup_cdllist_points(front, ref)
+    preprocessing(head, 3)
+    boxes = nondominated_boxes(head)
+    free_cdllist(head)
+
+    boxes = boxes[np.argsort(boxes[:, 4], kind='stable')]
+    x1, x2, y1, y2, z2 = boxes.T
+
+    improvements = np.zeros(len(candidates))
+    order = np.argsort(candidates[:, 2], kind='stable')
+    c = np.minimum(candidates[order], ref)
+    step = max(1, block_size // max(1, len(boxes)))
+
+    for start in range(0, len(c), step):
+        block = c[start:start + step]
+        first = np.searchsorted(z2, block[0, 2], side='right')  # boxes below the block do not count
+        dx = x2[first:] - np.maximum(x1[first:], block[:, 0:1])
+        dy = y2[first:] - np.maximum(y1[first:], block[:, 1:2])
+        dz = z2[first:] - block[:, 2:3]
+        np.maximum(dx, 0, out=dx)
+        np.maximum(dy, 0, out=dy)
+        np.maximum(dz, 0, out=dz)
+        improvements[order[start:start + step]] = np.einsum('ij,ij,ij->i', dx, dy, dz)
+
+    return improvements
+
+
+
+"""
+Decomposes the region dominated by the points in the list into disjoint boxes
+[x1, x2] x [y1, y2] x [z1, ref[2]] with a single sweep in z (as in hv3dplus): the area that a point p
+adds to the dominated region of the (x,y)-plane stays dominated from p.x[2] upwards, which gives one
+box per term of the area of p. Returns an (m, 5) array with the columns x1, x2, y1, y2, z1.
+Assumes that preprocessing has been called.
+"""
+def dominated_boxes(head):
+    return np.array(_sweep_boxes(head), dtype=float).reshape(-1, 5)
+
+
+"""
+Sweeps the list along the last coordinate (as in hv3dplus for d = 3 and hv4dplusR for d = 4) and
+returns the last coordinate of each point in the order of the sweep (of each nondominated point for
+d = 3) together with the area (d = 3) or the volume (d = 4) of the slice just above it. The
+hypervolume with the last coordinate of the reference point set to t is the integral of these slices
+up to t.
+For d = 3, assumes that preprocessing has been called.
+"""
+def hv_slices(head, d):
+    levels = []
+    measures = []
+
+    if d == 3:
+        area = 0
+        for p, added in sweep_3d(head, compute_area_simple, remove_dominated=False):
+            area += added
+            levels.append(p.x[2])
+            measures.append(area)
+    else:
+        stop = head.prev[3]
+        new = head.next[3].next[3]
+        while new != stop:
+            setup_z_and_closest(head, new)
+            add_to_z(new)
+            update_links(head, new, new.next[2])
+            levels.append(new.x[3])
+            measures.append(hv3dplus(head))
+            new = new.next[3]
+
+    return np.array(levels, dtype=float), np.array(measures, dtype=float)
+
+
+"""
+Computes the hypervolume of points (an (n, d) array, d = 3 or 4) for each threshold t on the last
+coordinate, i.e. with respect to the reference point (ref[0], ..., ref[d-2], t), in a single pass
+of hv3dplus/hv4dplusR (hv_slices). Returns an array with one hypervolume per threshold.
+"""
+def hv_threshold_curve(points, ref, thresholds):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    thresholds = np.asarray(thresholds, dtype=float).reshape(-1)
+    if len(thresholds) == 0:
+        return np.zeros(0)
+    top = thresholds.max()
+    ref = [float(r) for r in ref[:d - 1]] + [top]
+    points = points[np.all(points < ref, axis=1)]
+    if len(points) == 0:
+        return np.zeros(len(thresholds))
+
+    head = setup_cdllist_points(points, ref)
+    if d == 3:
+        preprocessing(head, 3)
+    levels, measures = hv_slices(head, d)
+    free_cdllist(head)
+
+    # hypervolume up to each level, then linear between consecutive levels
+    cumulative = np.concatenate(([0.0], np.cumsum(measures[:-1] * np.diff(levels))))
+    k = np.searchsorted(levels, thresholds, side='right') - 1
+    inside = k >= 0
+    curve = np.zeros(len(thresholds))
+    curve[inside] = cumulative[k[inside]] + measures[k[inside]] * (thresholds[inside] - levels[k[inside]])
+    return curve
+
+
+def _box_volumes(boxes, refs, block_size):
+    # Volumes of the boxes (x1, x2, y1, y2, z1) of dominated_boxes clipped to each reference point in refs
+    volumes = np.zeros(len(refs))
+    x1, x2, y1, y2, z1 = boxes.T
+    step = max(1, block_size // max(1, len(boxes)))
+    for start in range(0, len(refs), step):
+        block = refs[start:start + step]
+        dx = np.minimum(x2, block[:, 0:1]) - x1
+        dy = np.minimum(y2, block[:, 1:2]) - y1
+        dz = block[:, 2:3] - z1
+        np.maximum(dx, 0, out=dx)
+        np.maximum(dy, 0, out=dy)
+        np.maximum(dz, 0, out=dz)
+        volumes[start:start + step] = np.einsum('ij,ij,ij->i', dx, dy, dz)
+    return volumes
+
+
+"""
+Computes the hypervolume of points (an (n, d) array, d = 3 or 4) with respect to each reference
+point in refs (an (m, d) array), sharing the sort and the sweep among all of them.
+For d = 3, the region dominated with respect to the componentwise maximum of refs is decomposed
+once into boxes (dominated_boxes) and each hypervolume is the volume of the boxes clipped to its
+reference point. For d = 4, the points are sorted by w once and swept as in hv4dplusR: the 3-D slice
+above each point is decomposed into boxes, which are clipped to the reference points whose w is
+above the point. This takes O(n^2) time in Python plus O(n^2 m) in NumPy. If all reference points
+have the same first three coordinates, hv_threshold_curve is used instead (O(n^2), no boxes).
+"""
+def hv_multi_ref(points, refs, block_size=1 << 22):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    refs = np.asarray(refs, dtype=float).reshape(-1, d)
+    hvs = np.zeros(len(refs))
+    if len(refs) == 0:
+        return hvs
+
+    if d == 4 and np.all(refs[:, :3] == refs[0, :3]):
+        return hv_threshold_curve(points, refs[0, :3], refs[:, 3])
+
+    top = refs.max(axis=0)
+    points = points[np.all(points < top, axis=1)]
+    head = setup_cdllist_points(points, top)
+    if d == 3:
+        preprocessing(head, 3)
+        hvs = _box_volumes(dominated_boxes(head), refs, block_size)
+        free_cdllist(head)
+        return hvs
+
+    order = np.argsort(refs[:, 3], kind='stable')
+    levels = refs[order, 3]
+    stop = head.prev[3]
+    new = head.next[3].next[3]
+    while new != stop:
+        setup_z_and_closest(head, new)
+        add_to_z(new)
+        update_links(head, new, new.next[2])
+        boxes = np.array(_sweep_boxes(head, remove_dominated=True), dtype=float).reshape(-1, 5)
+
+        # only the reference points with w above new get a part of this slice
+        w, w_next = new.x[3], new.next[3].x[3]
+        active = order[np.searchsorted(levels, w, side='right'):]
+        if w_next > w and len(active) > 0:
+            heights = np.minimum(refs[active, 3], w_next) - w
+            hvs[active] += _box_volumes(boxes, refs[active, :3], block_size) * heights
+        new = new.next[3]
+
+    free_cdllist(head)
+    return hvs
+
+
+"""
+Computes the hypervolume of many small 3-D fronts at once, given as a padded (B, n, 3) array (rows
+with NaN or that do not strictly dominate the reference point are ignored) or as an (N, 3) array of
+stacked fronts together with offsets (B + 1 indices such that front b is fronts[offsets[b]:offsets[b+1]]).
+refs is one reference point or a (B, 3) array. Returns a (B,) array.
+The sweep in z is run for a block of fronts at a time with NumPy: after sorting each front by z, the
+area of the (x,y)-plane dominated by the first i points is the sum, over the points sorted by x, of
+the width to the next point times the height above the lowest y among the first i points up to
+that x (a running minimum). This takes O(n^2) time per front, but no Python loop over the points.
+"""
+def hv3d_batch(fronts, refs, offsets=None, block_size=1 << 18):
+    fronts = np.asarray(fronts, dtype=float)
+    if offsets is not None:
+        offsets = np.asarray(offsets, dtype=int)
+        counts = np.diff(offsets)
+        padded = np.full((len(counts), max(counts.max(initial=0), 1), 3), np.nan)
+        rows = np.repeat(np.arange(len(counts)), counts)
+        cols = np.arange(counts.sum()) - np.repeat(offsets[:-1] - offsets[0], counts)
+        padded[rows, cols] = fronts[offsets[0]:offsets[-1]]
+        fronts = padded
+    b, n, _ = fronts.shape
+    refs = np.broadcast_to(np.asarray(refs, dtype=float), (b, 3))
+    hvs = np.zeros(b)
+    if n == 0:
+        return hvs
+
+    step = max(1, block_size // (n * n))
+    for start in range(0, b, step):
+        ref = refs[start:start + step, None, :]
+        points = fronts[start:start + step]
+        # the ignored points are moved to the reference point, where they add nothing
+        points = np.where(np.all(points < ref, axis=2)[:, :, None], points, ref)
+
+        order = np.argsort(points[:, :, 2], axis=1, kind='stable')
+        points = np.take_along_axis(points, order[:, :, None], axis=1)
+        dz = np.diff(np.concatenate((points[:, :, 2], ref[:, :, 2]), axis=1), axis=1)
+
+        # rank in z of each point in the order of x
+        rank = np.argsort(points[:, :, 0], axis=1, kind='stable')
+        x = np.take_along_axis(points[:, :, 0], rank, axis=1)
+        y = np.take_along_axis(points[:, :, 1], rank, axis=1)
+        dx = np.diff(np.concatenate((x, ref[:, :, 0]), axis=1), axis=1)
+
+        # heights[:, k, i]: lowest y among the first i + 1 points in z with x up to the k-th x
+        in_slice = rank[:, :, None] <= np.arange(n)[None, None, :]
+        heights = np.where(in_slice, y[:, :, None], ref[:, :, 1:2])
+        np.minimum.accumulate(heights, axis=1, out=heights)
+        areas = np.einsum('bki,bk->bi', ref[:, :, 1:2] - heights, dx)
+        hvs[start:start + step] = np.einsum('bi,bi->b', areas, dz)
+
+    return hvs
         
 """Compute the hypervolume indicator in d=4 by iteratively
    computing the hypervolume indicator in d=3 (using hv3d+) """
 
 def hv4dplusR(head):
+    if stats is not None:
+        tic = time.perf_counter()
     height = 0
     volume = 0
     hv = 0
@@ -431,6 +945,8 @@ def hv4dplusR(head):
         
         new = new.next[3]
         
+    if stats is not None:
+        stats.add_phase('hv4dplusR', tic)
     return hv
 
 
@@ -440,6 +956,8 @@ computing the one contribution problem in d=3.
 """
 
 def hv4dplusU(head):
+    if stats is not None:
+        tic = time.perf_counter()
     height = 0
     volume = 0
     hv = 0
@@ -449,80 +967,152 @@ def hv4dplusU(head):
     
     while new != last:
         volume += one_contribution_3d(head, new)
-        add_to_z(new)
-        update_links(head, new, new.next[2])
+        if new.ndomr < 1:  # dominated points are not kept in the list sorted by z
+            add_to_z(new)
+            update_links(head, new, new.next[2])
         
         height = new.next[3].x[3] - new.x[3]
         hv += volume * height
         
         new = new.next[3]
         
+    if stats is not None:
+        stats.add_phase('hv4dplusU', tic)
     return hv
 
-from sortedcontainers import SortedList
+
+def setup_z_below(head, stop):
+    # Sets up the list sorted by z with the 4-D points that come before stop in w (dominated points in 3-D
+    # are not kept in the list, as in hv4dplusU)
+    nodes = []
+    p = head.next[3].next[3]
+    while p != stop:
+        clear_point(head, p)
+        nodes.append(p)
+        p = p.next[3]
+    nodes.sort(key=lambda p: (p.x[2], p.x[1], p.x[0]))
+
+    chain = [head.next[2]] + nodes + [head.prev[2]]
+    for p, q in zip(chain[:-1], chain[1:]):
+        p.next[2] = q
+        q.prev[2] = p
+    preprocessing(head, 3)
+    for p in nodes:
+        if p.ndomr > 0:
+            remove_from_z(p)
+
+
+"""
+Streaming version of hv4dplusU for points that arrive in nondecreasing order of the
+last coordinate w. The state of the hv4dplusU loop (the list sorted by z, the volume of
+the current 3-D slice and the hypervolume of the closed slices) is kept between calls,
+so each appended point costs one one_contribution_3d and update_links step, i.e. O(n).
+The last slice is closed lazily at ref[3]. Points dominated in 4-D are dropped.
+"""
+class HV4DAppender:
+    def __init__(self, ref, points=None):
+        self.ref = [float(r) for r in ref]
+        self.head = init_sentinels_new([DLNode(), DLNode(), DLNode()], self.ref, 4)
+        self.volume = 0  # hypervolume of the current 3-D slice
+        self.hv = 0  # hypervolume of the slices below last_w
+        self.last_w = float('-inf')
+        self.n = 0  # number of appended points
+        if points is not None:
+            self.extend(points)
+
+    def append(self, point):
+        # Returns the increase of the volume of the current 3-D slice
+        x = [float(c) for c in point]
+        if x[3] < self.last_w:
+            raise ValueError(f"w coordinate {x[3]} is smaller than the last one {self.last_w}")
+        self.n += 1
+        if self.volume > 0:  # close the slice [last_w, w) of the current 3-D volume
+            self.hv += self.volume * (min(x[3], self.ref[3]) - min(self.last_w, self.ref[3]))
+        self.last_w = x[3]
+        if any(x[i] >= self.ref[i] for i in range(4)):
+            return 0
+
+        head = self.head
+        new = DLNode(x)
+        clear_point(head, new)
+        contribution = one_contribution_3d(head, new)
+        self.volume += contribution
+        if new.ndomr < 1:
+            add_to_z(new)
+            update_links(head, new, new.next[2])
+        return contribution
+
+    def extend(self, points):
+        for point in points:
+            self.append(point)
+
+    def total_hv(self):
+        if self.volume == 0:
+            return self.hv
+        return self.hv + self.volume * max(self.ref[3] - self.last_w, 0)
+
+    def get_points(self):
+        # Points nondominated in the current 3-D slice, sorted by z
+        head = self.head
+        p = head.next[2].next[2]
+        points = []
+        while p != head.prev[2]:
+            points.append(list(p.x))
+            p = p.next[2]
+        return points
+
+    def __len__(self):
+        return self.n
+
+from sortedcontainers import SortedKeyList, SortedList
 
 """
 Function for preprocessing nodes in 3-D.
-Sets up closest[0] and closest[1] for each node.
+Sets up closest[0], closest[1] and ndomr for each node in a single sweep in z,
+as in the preprocessing function of the original C code. The points swept so far
+that are nondominated in (x, y) are kept in a tree sorted by ascending y, so that
+the neighbours of each new point are found by bisection, i.e. in O(n log n) overall.
 Input for preprocessing is the output from setup_cdllist (head node).
+The sweep can be resumed at the node start, when the nodes below start have already been processed,
+by giving the staircase of these nodes (including both sentinels) in ascending order of y.
 """
 
-def preprocessing(head, d):
+def preprocessing(head, d, start=None, staircase=None):
+    if stats is not None:
+        tic = time.perf_counter()
     di = d - 1  # Dimension index for sorting (z-axis in 3D)
-    current = head.next[di]
     stop = head.prev[di]
 
-    # Using SortedList to manage nodes by their y-coordinate, supporting custom sorting needs
-    avl_tree = SortedList(key=lambda node: (node.x[1], node.x[0]))
-
-    # Include sentinel nodes to manage edge conditions
-    avl_tree.add(head)  # head is a left sentinel
-    avl_tree.add(head.prev[di])  # right sentinel
+    # The tree is sorted by y, ties are broken by x (as in compare_tree_asc_y + avl_search_closest).
+    # The sentinels (ref[0], -inf) and (-inf, ref[1]) delimit the staircase on both sides
+    avl_tree = SortedKeyList(key=lambda node: (node.x[1], node.x[0]))
+    if staircase is None:
+        avl_tree.add(head.next[di])
+        avl_tree.add(head)
+    else:
+        avl_tree.update(staircase)
 
+    current = head.next[di].next[di] if start is None else start
     while current != stop:
-        avl_tree.add(current)
-        index = avl_tree.index(current)
-
-        # Check if current node is dominated by any previous node in avl_tree
-        dominated = False
-        for node in avl_tree:
-            if node != current and all(node.x[i] <= current.x[i] for i in range(3)) and any(node.x[i] < current.x[i] for i in range(3)):
-                dominated = True
-                break
+        x = current.x
+        # Index of the first node that comes after the current one in the tree
+        index = avl_tree.bisect_key_right((x[1], x[0]))
+        prev = avl_tree[index - 1]
 
-        if dominated:
+        if prev.x[0] <= x[0] and prev.x[1] <= x[1]:
+            # prev comes before current in z, so it dominates current
             current.ndomr = 1
-            avl_tree.remove(current)
-        else:
-            # Remove nodes dominated by the current node
-            nodes_to_remove = [node for node in avl_tree if node != current and all(current.x[i] <= node.x[i] for i in range(3)) and any(current.x[i] < node.x[i] for i in range(3))]
-            for node in nodes_to_remove:
-                avl_tree.remove(node)
-                node.ndomr = 1
-
-        # Determine closest[0]: smallest q such that q_x > p_x and q_y < p_y
-        x_candidates = [node for node in avl_tree if node.x[0] > current.x[0] and node.x[1] < current.x[1]]
-        if x_candidates:
-            current.closest[0] = min(x_candidates, key=lambda node: node.x[0])
-        else:
-            current.closest[0] = head  # Fallback to sentinel if no valid candidate
-
-        # Determine closest[1]: smallest q such that q_x < p_x and q_y > p_y
-        y_candidates = [node for node in avl_tree if node.x[0] < current.x[0] and node.x[1] > current.x[1]]
-        if y_candidates:
-            current.closest[1] = min(y_candidates, key=lambda node: node.x[1])
         else:
-            current.closest[1] = head.prev[di]  # Fallback to sentinel if no valid candidate
+            # Remove the nodes that are dominated by current in (x, y)
+            while avl_tree[index].x[0] >= x[0]:
+                del avl_tree[index]
 
-        # Adjust closest if it points to itself
-        if current.closest[0] == current:
-            current.closest[0] = head
-        if current.closest[1] == current:
-            current.closest[1] = head.prev[di]
+            avl_tree.add(current)
+            current.closest[0] = prev
+            current.closest[1] = avl_tree[index + 1]
 
         current = current.next[di]
 
     avl_tree.clear()  # Clean up AVL tree after processing
-
-
-
+    if stats is not None:
+        stats.add_phase('preprocessing', tic)
@@ -0,0 +1,417 @@
+import numpy as np
+from sortedcontainers import SortedKeyList
+from hv_plus import lexsort_points
+
+"""
+Array-backed (structure-of-arrays) version of the data structure and the algorithms from hv_plus.py.
+Instead of one DLNode object per point, the coordinates of all nodes are stored in one contiguous
+float64 array and the links (closest, cnext, next, prev) are stored in int32 arrays of node indices.
+Nodes 0, 1 and 2 are the sentinels, the head of the list is node 0.
+"""
+
+S1, S2, S3 = 0, 1, 2  # indices of the sentinels
+
+# ------------------- Data Structure ------------------------
+
+class DLArray:
+    def __init__(self, n):
+        size = n + 3
+        self.n = n
+        self.x = np.zeros(4 * size)                        # x[4*i + k] is the k-th coordinate of node i
+        self.closest = np.zeros(2 * size, dtype=np.int32)  # closest in x coordinate, closest in y coordinate
+        self.cnext = np.zeros(2 * size, dtype=np.int32)    # current next
+        self.next = np.zeros(2 * size, dtype=np.int32)     # next in z, next in w
+        self.prev = np.zeros(2 * size, dtype=np.int32)     # prev in z, prev in w
+        self.ndomr = np.zeros(size, dtype=np.int32)        # number of dominators
+
+        # memoryviews are used for element access in the loops (faster than indexing numpy arrays)
+        self.xv = memoryview(self.x)
+        self.closestv = memoryview(self.closest)
+        self.cnextv = memoryview(self.cnext)
+        self.nextv = memoryview(self.next)
+        self.prevv = memoryview(self.prev)
+        self.ndomrv = memoryview(self.ndomr)
+
+    def nbytes(self):
+        return self.x.nbytes + self.closest.nbytes + self.cnext.nbytes + self.next.nbytes + self.prev.nbytes + self.ndomr.nbytes
+
+    def point(self, i):
+        return self.x[4 * i: 4 * i + 4].tolist()
+
+# ----------------------------- Data Structure Functions -----------------------------------------
+
+def init_sentinels(store, ref, d):
+    x, closest, nxt, prv = store.x, store.closest, store.next, store.prev
+    inf = float('inf')
+
+    # Initialize s1 node
+    x[0:4] = [-inf, ref[1], -inf, -inf]
+    closest[0:2] = [S2, S1]
+    nxt[0:2] = [S2, S2]
+    prv[0:2] = [S3, S3]
+
+    # Initialize s2 node
+    x[4:8] = [ref[0], -inf, -inf, -inf]
+    closest[2:4] = [S2, S1]
+    nxt[2:4] = [S3, S3]
+    prv[2:4] = [S1, S1]
+
+    # Initialize s3 node
+    x[8:12] = [-inf, -inf, ref[2], ref[3] if d == 4 else -inf]
+    closest[4:6] = [S2, S1]
+    nxt[4:6] = [S1, -1]
+    prv[4:6] = [S2, S2]
+
+    store.cnext[0:6] = -1
+    store.ndomr[0:3] = 0
+    return S1
+
+
+"""Sets up a circular doubly-linked list stored in arrays from an (n, d) array of points"""
+def setup_cdllist_points(points, ref):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    store = DLArray(n)
+    init_sentinels(store, ref, d)
+    di = d - 1
+
+    if n > 0:
+        x = store.x.reshape(n + 3, 4)
+        x[3:, :d] = points[lexsort_points(points)]
+
+        # Reset the points (clear_point) and link them in the order given by lexsort
+        nodes = np.arange(3, n + 3, dtype=np.int32)
+        store.closest[6::2] = S2
+        store.closest[7::2] = S1
+        store.cnext[6::2] = S2
+        store.cnext[7::2] = S1
+
+        k = di - 2  # offset of dimension di in next and prev
+        store.next[6 + k::2] = nodes + 1
+        store.prev[6 + k::2] = nodes - 1
+        store.next[2 * (n + 2) + k] = store.next[2 * S2 + k]
+        store.prev[6 + k] = S2
+        store.next[2 * S2 + k] = 3
+        store.prev[2 * S3 + k] = n + 2
+
+    return store
+
+"""Sets up a circular doubly-linked list stored in arrays from a flat list of n points in d dimensions"""
+def setup_cdllist(data, n, d, ref):
+    return setup_cdllist_points(np.asarray(data, dtype=float).reshape(n, d), ref)
+
+def free_cdllist(store):
+    del store
+
+"Auxiliary function for printing elements of the array-backed cdllist"
+def print_cdllist(store, di):
+    print("Circular Doubly-Linked List:")
+    current = store.next[2 * S1 + di - 2]
+    while current != -1 and current != S1:
+        print(store.point(current))
+        current = store.next[2 * current + di - 2]
+
+# --------------------- Updating Data Structures --------------------------
+
+def add_to_z(store, new):
+    nxt, prv = store.nextv, store.prevv
+    p = prv[2 * new]
+    q = nxt[2 * p]
+    nxt[2 * new] = q
+    prv[2 * q] = new
+    nxt[2 * p] = new
+
+def remove_from_z(store, old):
+    nxt, prv = store.nextv, store.prevv
+    p = prv[2 * old]
+    q = nxt[2 * old]
+    nxt[2 * p] = q
+    prv[2 * q] = p
+
+
+def setup_z_and_closest(store, head, new):
+    x, nxt, prv = store.xv, store.nextv, store.prevv
+    closest, cnext, ndomr = store.closestv, store.cnextv, store.ndomrv
+
+    closest1 = head
+    closest0 = nxt[2 * head]
+
+    q = nxt[2 * closest0]
+    nx0, nx1, nx2 = x[4 * new], x[4 * new + 1], x[4 * new + 2]
+
+    while True:
+        qx0, qx1, qx2 = x[4 * q], x[4 * q + 1], x[4 * q + 2]
+        # lexicographic_less(q.x, new.x)
+        if not (qx2 < nx2 or (qx2 == nx2 and (qx1 < nx1 or (qx1 == nx1 and qx0 <= nx0)))):
+            break
+        if qx0 <= nx0 and qx1 <= nx1:
+            ndomr[new] += 1
+        elif qx1 < nx1 and (qx0 < x[4 * closest0] or (qx0 == x[4 * closest0] and qx1 < x[4 * closest0 + 1])):
+            closest0 = q
+        elif qx0 < nx0 and (qx1 < x[4 * closest1 + 1] or (qx1 == x[4 * closest1 + 1] and qx0 < x[4 * closest1])):
+            closest1 = q
+
+        q = nxt[2 * q]
+
+    closest[2 * new] = cnext[2 * new] = closest0
+    closest[2 * new + 1] = cnext[2 * new + 1] = closest1
+    prv[2 * new] = prv[2 * q]
+    nxt[2 * new] = q
+
+# ------------------- Update Links --------------------
+
+def update_links(store, head, new, p):
+    x, nxt, prv = store.xv, store.nextv, store.prevv
+    closest, ndomr = store.closestv, store.ndomrv
+
+    stop = prv[2 * head]
+    ndom = 0
+    nx0, nx1, nx2 = x[4 * new], x[4 * new + 1], x[4 * new + 2]
+
+    while p != stop:
+        px0, px1 = x[4 * p], x[4 * p + 1]
+        if px0 <= nx0 and px1 <= nx1 and (px0 < nx0 or px1 < nx1):
+            break  # all delimiters visited
+        if nx0 <= px0:
+            if nx1 <= px1:
+                ndomr[p] += 1
+                ndom += 1
+                # remove_from_z(p)
+                a, b = prv[2 * p], nxt[2 * p]
+                nxt[2 * a] = b
+                prv[2 * b] = a
+            elif nx0 < px0:
+                c = 4 * closest[2 * p + 1]
+                if nx1 < x[c + 1] or (nx1 == x[c + 1] and (nx0 < x[c] or (nx0 == x[c] and nx2 < x[c + 2]))):
+                    closest[2 * p + 1] = new
+        elif nx1 < px1:
+            c = 4 * closest[2 * p]
+            if nx0 < x[c] or (nx0 == x[c] and (nx1 < x[c + 1] or (nx1 == x[c + 1] and nx2 < x[c + 2]))):
+                closest[2 * p] = new
+        p = nxt[2 * p]
+    return ndom
+
+# ------------------------- Hyperovlume Indicator Algorithms ---------------------------------------
+def restart_list_y(store, head):
+    # resets the cnext pointers for the y-dimension.
+    cnext = store.cnextv
+    s = store.nextv[2 * head]
+    cnext[2 * s + 1] = head
+    cnext[2 * head] = s
+
+def compute_area_simple(store, p, di, s, u):
+    x, cnext = store.xv, store.cnextv
+    dj = 1 - di
+    pdi, pdj = p[di], p[dj]
+    area = (x[4 * s + dj] - pdj) * (x[4 * u + di] - pdi)
+
+    while pdj < x[4 * u + dj]:
+        q = u
+        u = cnext[2 * u + di]
+        area += (x[4 * q + dj] - pdj) * (x[4 * u + di] - x[4 * q + di])
+
+    return area
+
+# ----------------------------------------------------------------
+
+def restart_base_setup_z_and_closest(store, head, new):
+    # Sets up closest[0] and closest[1] for the new node
+    x, nxt, prv = store.xv, store.nextv, store.prevv
+    closest, cnext, ndomr = store.closestv, store.cnextv, store.ndomrv
+
+    closest1 = head
+    closest0 = nxt[2 * head]
+    p = nxt[2 * closest0]
+    nx0, nx1, nx2 = x[4 * new], x[4 * new + 1], x[4 * new + 2]
+
+    restart_list_y(store, head)
+
+    while True:
+        px0, px1, px2 = x[4 * p], x[4 * p + 1], x[4 * p + 2]
+        if not (px2 < nx2 or (px2 == nx2 and (px1 < nx1 or (px1 == nx1 and px0 <= nx0)))):
+            break
+        c0 = cnext[2 * p] = closest[2 * p]
+        c1 = cnext[2 * p + 1] = closest[2 * p + 1]
+        cnext[2 * c0 + 1] = p
+        cnext[2 * c1] = p
+
+        if px0 <= nx0 and px1 <= nx1:
+            ndomr[new] += 1
+        elif px1 < nx1 and (px0 < x[4 * closest0] or (px0 == x[4 * closest0] and px1 < x[4 * closest0 + 1])):
+            closest0 = p
+        elif px0 < nx0 and (px1 < x[4 * closest1 + 1] or (px1 == x[4 * closest1 + 1] and px0 < x[4 * closest1])):
+            closest1 = p
+
+        p = nxt[2 * p]
+
+    closest[2 * new] = closest0
+    closest[2 * new + 1] = closest1
+    prv[2 * new] = prv[2 * p]
+    nxt[2 * new] = p
+
+
+# --------------- one contribution 3d ------------------
+
+def one_contribution_3d(store, head, new):
+    restart_base_setup_z_and_closest(store, head, new)
+    if store.ndomr[new] > 0:
+        return 0
+
+    x, nxt = store.xv, store.nextv
+    closest, cnext = store.closestv, store.cnextv
+
+    nx0, nx1, nx2 = x[4 * new], x[4 * new + 1], x[4 * new + 2]
+    cnext[2 * new] = closest[2 * new]
+    cnext[2 * new + 1] = closest[2 * new + 1]
+    area = compute_area_simple(store, (nx0, nx1), 1, cnext[2 * new], cnext[2 * cnext[2 * new] + 1])
+
+    p = nxt[2 * new]
+    lastz = nx2
+    volume = 0
+
+    while x[4 * p] > nx0 or x[4 * p + 1] > nx1:
+        px0, px1, px2 = x[4 * p], x[4 * p + 1], x[4 * p + 2]
+        volume += area * (px2 - lastz)
+        c0 = cnext[2 * p] = closest[2 * p]
+        c1 = cnext[2 * p + 1] = closest[2 * p + 1]
+
+        if px0 >= nx0 and px1 >= nx1:
+            area -= compute_area_simple(store, (px0, px1), 1, c0, cnext[2 * c0 + 1])
+            cnext[2 * c1] = p
+            cnext[2 * c0 + 1] = p
+        elif px0 >= nx0:
+            n0 = cnext[2 * new]
+            if px0 <= x[4 * n0]:
+                area -= compute_area_simple(store, (px0, nx1), 1, n0, cnext[2 * n0 + 1])
+                cnext[2 * p] = n0
+                cnext[2 * c1] = p
+                cnext[2 * new] = p
+        else:
+            n1 = cnext[2 * new + 1]
+            if px1 <= x[4 * n1 + 1]:
+                area -= compute_area_simple(store, (nx0, px1), 0, n1, cnext[2 * n1])
+                cnext[2 * p + 1] = n1
+                cnext[2 * c0 + 1] = p
+                cnext[2 * new + 1] = p
+
+        lastz = px2
+        p = nxt[2 * p]
+
+    volume += area * (x[4 * p + 2] - lastz)
+    return volume
+
+"""Main function for computing the hypervolume in 3-D"""
+def hv3dplus(store, head=S1):
+    x, nxt = store.xv, store.nextv
+    closest, cnext, ndomr = store.closestv, store.cnextv, store.ndomrv
+    area = 0
+    volume = 0
+
+    restart_list_y(store, head)
+    p = nxt[2 * nxt[2 * head]]
+    stop = store.prevv[2 * head]
+
+    while p != stop:
+        if ndomr[p] < 1:
+            c0 = cnext[2 * p] = closest[2 * p]
+            c1 = cnext[2 * p + 1] = closest[2 * p + 1]
+            area += compute_area_simple(store, (x[4 * p], x[4 * p + 1]), 1, c0, cnext[2 * c0 + 1])
+            cnext[2 * c0 + 1] = p
+            cnext[2 * c1] = p
+        else:
+            remove_from_z(store, p)
+
+        q = nxt[2 * p]
+        volume += area * (x[4 * q + 2] - x[4 * p + 2])
+        p = q
+
+    return volume
+
+
+"""Compute the hypervolume indicator in d=4 by iteratively
+   computing the hypervolume indicator in d=3 (using hv3d+) """
+
+def hv4dplusR(store, head=S1):
+    hv = 0
+    x, nxt = store.xv, store.nextv
+
+    stop = store.prevv[2 * head + 1]
+    new = nxt[2 * nxt[2 * head + 1] + 1]
+
+    while new != stop:
+        setup_z_and_closest(store, head, new)
+        add_to_z(store, new)
+        update_links(store, head, new, nxt[2 * new])
+
+        volume = hv3dplus(store, head)
+
+        height = x[4 * nxt[2 * new + 1] + 3] - x[4 * new + 3]
+        hv += volume * height
+
+        new = nxt[2 * new + 1]
+
+    return hv
+
+
+"""
+Compute the hypervolume indicator in d=4 by iteratively
+computing the one contribution problem in d=3.
+"""
+
+def hv4dplusU(store, head=S1):
+    volume = 0
+    hv = 0
+    x, nxt = store.xv, store.nextv
+
+    last = store.prevv[2 * head + 1]
+    new = nxt[2 * nxt[2 * head + 1] + 1]
+
+    while new != last:
+        volume += one_contribution_3d(store, head, new)
+        if store.ndomr[new] < 1:  # dominated points are not kept in the list sorted by z
+            add_to_z(store, new)
+            update_links(store, head, new, nxt[2 * new])
+
+        height = x[4 * nxt[2 * new + 1] + 3] - x[4 * new + 3]
+        hv += volume * height
+
+        new = nxt[2 * new + 1]
+
+    return hv
+
+
+"""
+Function for preprocessing nodes in 3-D (see preprocessing in hv_plus.py).
+Sets up closest[0], closest[1] and ndomr for each node in a single sweep in z.
+"""
+
+def preprocessing(store, d, head=S1):
+    di = d - 1
+    x, nxt = store.xv, store.nextv
+    closest, ndomr = store.closestv, store.ndomrv
+    k = di - 2
+    stop = store.prevv[2 * head + k]
+
+    avl_tree = SortedKeyList(key=lambda i: (x[4 * i + 1], x[4 * i]))
+    avl_tree.add(nxt[2 * head + k])
+    avl_tree.add(head)
+
+    current = nxt[2 * nxt[2 * head + k] + k]
+    while current != stop:
+        cx0, cx1 = x[4 * current], x[4 * current + 1]
+        index = avl_tree.bisect_key_right((cx1, cx0))
+        prev = avl_tree[index - 1]
+
+        if x[4 * prev] <= cx0 and x[4 * prev + 1] <= cx1:
+            ndomr[current] = 1
+        else:
+            while x[4 * avl_tree[index]] >= cx0:
+                del avl_tree[index]
+
+            avl_tree.add(current)
+            closest[2 * current] = prev
+            closest[2 * current + 1] = avl_tree[index + 1]
+
+        current = nxt[2 * current + k]
+
+    avl_tree.clear()
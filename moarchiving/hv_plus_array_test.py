@@ -0,0 +1,62 @@
+import numpy as np
+import hv_plus
+import hv_plus_array
+
+"""
+Examples for the array-backed data structure (hv_plus_array.py).
+The hypervolume is computed with both data structures and the results are compared.
+"""
+
+print('Example for hv3dplus - points are the same as in test.inp')
+points = [
+    0.16, 0.86, 0.47,
+    0.66, 0.37, 0.29,
+    0.79, 0.79, 0.04,
+    0.28, 0.99, 0.29,
+    0.51, 0.37, 0.38,
+    0.92, 0.62, 0.07,
+    0.16, 0.53, 0.70,
+    0.01, 0.98, 0.94,
+    0.67, 0.17, 0.54,
+    0.79, 0.72, 0.05
+]
+ref = [1, 1, 1]
+
+store = hv_plus_array.setup_cdllist(points, 10, 3, ref)
+hv_plus_array.print_cdllist(store, 2)
+hv_plus_array.preprocessing(store, 3)
+print("Hypervolume in 3D (array-backed):", hv_plus_array.hv3dplus(store))
+
+head = hv_plus.setup_cdllist(points, 10, 3, ref)
+hv_plus.preprocessing(head, 3)
+print("Hypervolume in 3D (DLNode):", hv_plus.hv3dplus(head))
+print("\n")
+
+print('Example for hv4dplusR and hv4dplusU')
+points = [
+0.0651, 0.0465, 0.0206, 0.1705,
+0.1560, 0.0977, 0.0581, 0.1834,
+0.3042, 0.1395, 0.1818, 0.2912,
+0.3046, 0.1560, 0.1997, 0.3664,
+0.3745, 0.2123, 0.2921, 0.4402,
+0.4561, 0.5248, 0.4319, 0.5142,
+0.5924, 0.7081, 0.6075, 0.5987,
+0.6011, 0.7852, 0.6842, 0.8084,
+0.6119, 0.9489, 0.7320, 0.8662,
+0.8324, 0.9507, 0.9656, 0.9699
+]
+ref = [1, 1, 1, 1]
+
+store = hv_plus_array.setup_cdllist(points, 10, 4, ref)
+print("Hypervolume in 4D with hv4dplusR (array-backed):", hv_plus_array.hv4dplusR(store))
+store = hv_plus_array.setup_cdllist(points, 10, 4, ref)
+print("Hypervolume in 4D with hv4dplusU (array-backed):", hv_plus_array.hv4dplusU(store))
+head = hv_plus.setup_cdllist(points, 10, 4, ref)
+print("Hypervolume in 4D with hv4dplusR (DLNode):", hv_plus.hv4dplusR(head))
+print("\n")
+
+print('Memory used by the data structure')
+n = 10000
+random_points = np.random.default_rng(42).random((n, 3))
+store = hv_plus_array.setup_cdllist(random_points, n, 3, [1, 1, 1])
+print(f"Bytes per point (array-backed): {store.nbytes() / n:.1f}")
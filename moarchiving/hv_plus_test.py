@@ -1,3 +1,4 @@
+import gc
 from hv_plus import DLNode, lexicographic_less, init_sentinels, clear_point, point2struct, add_to_z, remove_from_z, setup_z_and_closest, update_links, compare_points_3d, compare_points_4d, sort_3d, sort_4d, free_cdllist, restart_list_y, compute_area_simple, restart_base_setup_z_and_closest, one_contribution_3d
 
 
@@ -382,3 +383,102 @@ print('\n')
 
     
 
+
+
+# -------------------- Example for reusing the nodes of the node pool ------------------------
+print("Example for reusing the nodes of the node pool")
+import numpy as np
+from hv_plus import NodePool, node_pool, setup_cdllist_points, preprocessing, hv3dplus, hv4dplusU
+
+def hv_with_pool(points, ref, pool):
+    head = setup_cdllist_points(points, ref, pool)
+    if points.shape[1] == 3:
+        preprocessing(head, 3)
+        hv = hv3dplus(head)
+    else:
+        hv = hv4dplusU(head)
+    free_cdllist(head, pool)
+    return hv
+
+np.random.seed(1)
+inputs = [(np.random.rand(50, 3), [1, 1, 1]), (np.random.rand(20, 4), [1, 1, 1, 1]),
+          (np.random.rand(80, 3), [1, 1, 1]), (np.random.rand(50, 3), [1, 1, 1])]
+hvs_fresh = [hv_with_pool(points, ref, NodePool()) for points, ref in inputs]
+# the lists of different sizes and dimensions are set up one after the other from the same nodes
+hvs_reused = [hv_with_pool(points, ref, node_pool) for points, ref in inputs]
+print("Same hypervolumes with reused nodes:", hvs_fresh == hvs_reused)
+assert hvs_fresh == hvs_reused
+
+head = setup_cdllist_points(inputs[0][0], inputs[0][1])
+free_cdllist(head)
+try:
+    hv3dplus(head)
+    print("A freed list can still be used")
+except (AttributeError, TypeError):
+    print("A freed list cannot be used anymore")
+
+pool = NodePool(max_size=100)
+free_cdllist(setup_cdllist_points(np.random.rand(1000, 3), [1, 1, 1], pool), pool)
+print("Nodes kept by a pool with max_size=100 after a list of 1000 points:", len(pool.nodes))
+assert len(pool.nodes) == 100
+
+# the links of the pooled nodes are cleared, so the other nodes of the freed list can be collected
+gc.collect()
+alive_before = sum(isinstance(obj, DLNode) for obj in gc.get_objects())
+free_cdllist(setup_cdllist_points(np.random.rand(20000, 3), [1, 1, 1], pool), pool)
+gc.collect()
+alive_after = sum(isinstance(obj, DLNode) for obj in gc.get_objects())
+print("Nodes still alive after freeing a list of 20000 points into the pool:", alive_after - alive_before)
+assert alive_after - alive_before == 0  # the pool was already full, its 100 nodes were reused
+print('\n')
+
+
+# -------------------- Example for setup_cdllist_points ------------------------
+print("Example for setup_cdllist_points - same list as the one set up point by point")
+from hv_plus import DLNode, init_sentinels_new, setup_cdllist
+
+def setup_cdllist_point_by_point(points, ref):
+    # the list as it was set up before setup_cdllist_points: sort, then one node at a time
+    n, d = points.shape
+    head = [DLNode() for _ in range(n + 3)]
+    init_sentinels_new(head[0:3], ref, d)
+    di = d - 1
+    s1, s2 = head[0], head[1]
+    for node, point in zip(head[3:], points[np.lexsort(points.T)].tolist()):
+        node.x = point + [0.0] if d == 3 else point
+        node.closest[0] = node.cnext[0] = s2
+        node.closest[1] = node.cnext[1] = s1
+        node.ndomr = 0
+    chain = head[1:2] + head[3:] + head[2:3]
+    for a, b in zip(chain[:-1], chain[1:]):
+        a.next[di] = b
+        b.prev[di] = a
+    return head[0]
+
+def list_fields(head, d):
+    # coordinates, ndomr and sentinel links of the nodes in the order of the list
+    di = d - 1
+    s1, s2, s3 = head, head.next[di], head.prev[di]
+    names = {id(s1): 's1', id(s2): 's2', id(s3): 's3'}
+    fields = []
+    p = s2.next[di]
+    while p is not s3:
+        assert p.next[di].prev[di] is p
+        fields.append((list(p.x), p.ndomr, [names.get(id(q)) for q in p.closest + p.cnext]))
+        p = p.next[di]
+    return fields
+
+np.random.seed(4)
+for d in [3, 4]:
+    points = np.random.randint(0, 5, (40, d))  # integer input with ties
+    ref = [5] * d
+    # the pooled nodes still hold the state of the lists set up before
+    free_cdllist(setup_cdllist_points(np.random.rand(60, 4), [1] * 4))
+    same = list_fields(setup_cdllist_points(points, ref), d) == list_fields(setup_cdllist_point_by_point(points, ref), d)
+    same_flat = list_fields(setup_cdllist(points.ravel().tolist(), 40, d, ref), d) == list_fields(setup_cdllist_point_by_point(points, ref), d)
+    print(f"{d}-D: same list as point by point:", same, "(setup_cdllist:", same_flat, ")")
+    assert same and same_flat
+head = setup_cdllist_points(np.array([[1, 2, 3]]), [4, 4, 4])
+print("Integer coordinates are stored as floats:", head.next[2].next[2].x[:3])
+assert all(type(v) is float for v in head.next[2].next[2].x)
+print('\n')
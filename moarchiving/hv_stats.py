@@ -0,0 +1,82 @@
+import threading
+import time
+from contextlib import contextmanager
+import hv_plus
+
+"""
+Opt-in instrumentation of the linked-list engines (hv_plus.py and the modules built on it).
+The engines count their work themselves (update_links, compute_area_simple, remove_from_z) and
+time their phases (PHASES), but only while hv_plus.stats is set, which collect_stats does for the
+duration of the block. Otherwise the only cost is one check per call.
+The counters are those of the current process: computations in other threads during the block are
+included, computations in worker processes (hv_parallel.py) are not.
+
+Example:
+    with collect_stats() as stats:
+        hv = hv_plus.hv4dplusU(head)
+    print(stats.summary())
+"""
+
+# functions whose calls and wall time are recorded as phases
+PHASES = ['setup_cdllist_points', 'preprocessing', 'hv3dplus', 'hv4dplusR', 'hv4dplusU']
+
+_lock = threading.Lock()  # collect_stats blocks are not nested
+
+
+class EngineStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.update_links_calls = 0
+        self.update_links_visited = 0  # nodes visited by update_links
+        self.compute_area_calls = 0
+        self.compute_area_iterations = 0  # iterations of the loop of compute_area_simple
+        self.removed_from_z = 0  # (dominated) points removed with remove_from_z
+        self.phase_calls = {}
+        self.phase_times = {}  # wall time per phase (nested phases are included in the outer ones)
+
+    def add_phase(self, name, tic):
+        # Records one call of the phase name that started at time.perf_counter() == tic
+        self.phase_times[name] = self.phase_times.get(name, 0) + time.perf_counter() - tic
+        self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+
+    def as_dict(self):
+        return {
+            'update_links_calls': self.update_links_calls,
+            'update_links_visited': self.update_links_visited,
+            'compute_area_calls': self.compute_area_calls,
+            'compute_area_iterations': self.compute_area_iterations,
+            'removed_from_z': self.removed_from_z,
+            'phase_calls': dict(self.phase_calls),
+            'phase_times': dict(self.phase_times),
+        }
+
+    def summary(self):
+        lines = [
+            f"update_links: {self.update_links_calls} calls, {self.update_links_visited} nodes visited"
+            f" ({self.update_links_visited / max(self.update_links_calls, 1):.1f} per call)",
+            f"compute_area_simple: {self.compute_area_calls} calls, {self.compute_area_iterations} iterations"
+            f" ({self.compute_area_iterations / max(self.compute_area_calls, 1):.1f} per call)",
+            f"remove_from_z: {self.removed_from_z} points removed",
+        ]
+        for phase, t in self.phase_times.items():
+            lines.append(f"{phase}: {self.phase_calls[phase]} calls, {t:.6f} s")
+        return "\n".join(lines)
+
+
+"""
+Context manager that collects the statistics of the engines while it is active and yields the
+EngineStats object (a new one unless stats is given).
+"""
+@contextmanager
+def collect_stats(stats=None):
+    stats = stats if stats is not None else EngineStats()
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("the statistics are already being collected")
+    hv_plus.stats = stats
+    try:
+        yield stats
+    finally:
+        hv_plus.stats = None
+        _lock.release()
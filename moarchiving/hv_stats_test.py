@@ -0,0 +1,40 @@
+import numpy as np
+import hv_plus
+from hv_plus import hv3dplus, hv4dplusU  # the counters do not depend on how the engines are imported
+from hv_stats import collect_stats
+
+"""
+Examples for collect_stats (hv_stats.py) on small inputs whose counters are computed by hand.
+"""
+
+print('Example for collect_stats - hv3dplus on five 3-D points')
+# a, b and c form a staircase in (x, y), d is dominated by c and e covers all three in (x, y):
+# compute_area_simple is called for a, b, c and e, and only e passes staircase points (b, c and a),
+# d is removed from the list sorted by z, and the hypervolume is 3 + 5 + 0.8 * 6 + 0.2 * 12.25 = 15.25
+points = np.array([[1, 3, 1], [3, 1, 2], [2, 2, 3], [3, 3, 3.5], [0.5, 0.5, 3.8]])
+with collect_stats() as stats:
+    head = hv_plus.setup_cdllist_points(points, [4, 4, 4])
+    hv_plus.preprocessing(head, 3)
+    hv = hv3dplus(head)
+    hv_plus.free_cdllist(head)
+print("Hypervolume:", hv, "(expected 15.25)")
+print("compute_area_simple:", stats.compute_area_calls, "calls,", stats.compute_area_iterations,
+      "iterations (expected 4 and 3)")
+print("remove_from_z:", stats.removed_from_z, "points removed (expected 1)")
+print("Phases:", stats.phase_calls)
+print("\n")
+
+print('Example for collect_stats - hv4dplusU on three 4-D points')
+# the second point is dominated in 3-D by the first one and is not added to the list sorted by z,
+# update_links is called for the first point (nothing above it in z) and the third point (visits the first)
+# the hypervolume is 27 * 2 + (27 + 14 - 9) * 2 = 118
+points = np.array([[1, 1, 1, 0], [2, 2, 2, 1], [0, 3, 0.5, 2]])
+with collect_stats() as stats:
+    head = hv_plus.setup_cdllist_points(points, [4, 4, 4, 4])
+    hv = hv4dplusU(head)
+    hv_plus.free_cdllist(head)
+print("Hypervolume:", hv, "(expected 118)")
+print("update_links:", stats.update_links_calls, "calls,", stats.update_links_visited,
+      "nodes visited (expected 2 and 1)")
+print("Statistics are collected only inside the block:", hv_plus.stats is None)
+print(stats.summary())
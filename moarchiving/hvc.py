@@ -0,0 +1,1202 @@
+import numpy as np
+import hv_plus
+from hv_plus import DLNode, lexicographic_less, init_sentinels_new, add_to_z, remove_from_z, restart_list_y, compute_area_simple, lexsort_points
+from hv_plus import one_contribution_3d
+from hv_plus import preprocessing as hv_preprocessing, hv3dplus as hv_plus_hv3dplus
+from sortedcontainers import SortedKeyList
+
+"""
+Python version of hvc.c (related/HVC-master), i.e., the data structure used for computing and updating
+hypervolume contributions in 3-D. Points can be added to and removed from the data structure.
+The list functions of hv_plus.py are used where hvc.c does the same as hv-plus.c (the sentinels, the list
+sorted by z, compute_area_simple, one_contribution_3d and hv3dplus, which skip dominated points).
+The functions defined here differ from the ones of hv_plus.py as in hvc.c: dominated points stay in the
+list sorted by z with their number of dominators and their dominator (domr, which DLNode does not have),
+the nodes are HVCNode objects with the fields of the contributions, ids and the insertion history, and
+restart_base_setup_z_and_closest also rebuilds the heads of the contributions.
+"""
+
+# ------------------- Data Structure ------------------------
+
+class HVCNode(DLNode):
+    __slots__ = ('head', 'area', 'volume', 'last_slice_z', 'hvolume', 'oldvolume', 'domr', 'id')
+
+    def __init__(self, x=None):
+        super().__init__(x)
+        self.head = [None, None]  # lowest inner delimiters (0 - x, 1 - y)
+        self.area = 0
+        self.volume = 0  # contribution in 3D
+        self.last_slice_z = 0
+        self.hvolume = 0  # contribution in 4D
+        self.oldvolume = 0
+        self.domr = None  # dominator
+        self.id = -1  # index of the point in the input (-1 for sentinels and removed points)
+
+# ----------------------------- Data Structure Functions -----------------------------------------
+
+def init_sentinels(list_nodes, ref, d):
+    s1 = init_sentinels_new(list_nodes, ref, d)
+    for i, s in enumerate(list_nodes[0:3]):
+        s.head[0] = s.head[1] = s
+        s.area = s.volume = s.oldvolume = s.hvolume = 0
+        s.domr = None
+        s.id = -(i + 1)
+    s1.next[0] = s1.prev[0] = s1  # empty history
+    return s1
+
+def clear_point(head, p):
+    hv_plus.clear_point(head, p)
+    p.head[0] = p.cnext[0]
+    p.head[1] = p.cnext[1]
+    p.area = 0
+    p.volume = 0
+    p.oldvolume = 0
+    p.hvolume = 0
+    p.last_slice_z = p.x[2]
+    p.domr = None
+
+def point2struct(head, p, v, d):
+    p.x = list(v[:d])
+    clear_point(head, p)
+    return p
+
+
+"""
+next[0] and prev[0] are used to record the order in which points were added to the data structure.
+In the case of the points given to setup_cdllist, the order is the input order.
+"""
+def add_to_history(head, new):
+    new.next[0] = head
+    new.prev[0] = head.prev[0]
+    head.prev[0] = new
+    new.prev[0].next[0] = new
+
+def remove_from_history(old):
+    # Removes 'old' permanently from the insertion history (old must not be in the data structure)
+    old.prev[0].next[0] = old.next[0]
+    old.next[0].prev[0] = old.prev[0]
+
+def history(head):
+    # Nodes in the order in which they were added
+    nodes = []
+    p = head.next[0]
+    while p != head:
+        nodes.append(p)
+        p = p.next[0]
+    return nodes
+
+
+"""
+Sets up the circular doubly-linked list from an (n, d) array of points (d = 3 or 4).
+The id of each node is the index of its point in points and the history is the input order.
+"""
+def setup_cdllist_points(points, ref):
+    points = np.asarray(points)
+    n, d = points.shape
+    head = [HVCNode() for _ in range(n + 3)]
+    init_sentinels(head[0:3], ref, d)
+    di = d - 1
+    s1 = head[0]
+
+    if n > 0:
+        order = lexsort_points(points)
+        rows = points.tolist()
+        original_order = [None] * n
+        for node, index in zip(head[3:], order.tolist()):
+            point2struct(s1, node, rows[index], d)
+            node.id = index
+            original_order[index] = node
+
+        # Link nodes in sorted order
+        chain = [head[1]] + head[3:] + [head[2]]
+        for p, q in zip(chain[:-1], chain[1:]):
+            p.next[di] = q
+            q.prev[di] = p
+
+        for node in original_order:
+            add_to_history(s1, node)
+
+    return s1
+
+def setup_cdllist(data, n, d, ref):
+    return setup_cdllist_points(np.asarray(data).reshape(n, d), ref)
+
+
+"""
+Sets up closest[0], closest[1] and ndomr of each node (see preprocessing in hv_plus.py).
+Returns the number of dominated points found.
+"""
+def preprocessing(head, d):
+    hv_preprocessing(head, d)
+    ndom = 0
+    p = head.next[2].next[2]
+    stop = head.prev[2]
+    while p != stop:
+        if p.ndomr > 0:
+            p.domr = head
+            ndom += 1
+        p = p.next[2]
+    return ndom
+
+"""
+Sets up ndomr, domr, closest[0] and closest[1] of the dominated points as setup_z_and_closest does when
+the points are added one by one in the order of z (assumes that preprocessing has been called, which sets
+ndomr = 1 for every dominated point). Points dominated by more than one point get ndomr = 2 and are removed
+from the list sorted by z: no contribution depends on them, as after removing any one point they are still
+dominated by another point that is kept. Only the points that are dominated by a single point are compared
+with the points below them in z, so this takes O(n^2) time in the worst case, when most points are dominated
+by a single point. Returns the number of points dominated by a single point.
+"""
+def setup_single_dominators(head):
+    nodes = []
+    p = head.next[2].next[2]
+    stop = head.prev[2]
+    while p != stop:
+        nodes.append(p)
+        p = p.next[2]
+    if not nodes:
+        return 0
+
+    points = np.array([p.x for p in nodes], dtype=float)
+    dominated = np.array([p.ndomr > 0 for p in nodes], dtype=bool)
+    nd_index = np.flatnonzero(~dominated)
+    dom_index = np.flatnonzero(dominated)
+
+    # A point dominated by a dominated point is also dominated by the dominator of that point, so only the
+    # dominated points that are nondominated among the dominated ones can have a single dominator
+    candidates = dom_index[hv_plus.nondominated(points[dom_index])] if len(dom_index) else dom_index
+    single = np.zeros(len(nodes), dtype=bool)
+    dominator = {}
+    block = max(1, (1 << 20) // max(len(nd_index), 1))
+    for start in range(0, len(candidates), block):
+        index = candidates[start:start + block]
+        dominates = np.all(points[nd_index][None, :, :] <= points[index][:, None, :], axis=2)
+        for i, count, first in zip(index.tolist(), dominates.sum(axis=1).tolist(), dominates.argmax(axis=1).tolist()):
+            if count == 1:
+                single[i] = True
+                dominator[i] = nodes[nd_index[first]]
+
+    for i in dom_index[~single[dom_index]].tolist():
+        nodes[i].ndomr = 2
+        remove_from_z(nodes[i])
+
+    # closest[0] and closest[1] among the points kept below in z, as in setup_z_and_closest
+    kept = np.flatnonzero(~dominated | single)
+    x, y = points[kept, 0], points[kept, 1]
+    for j in np.flatnonzero(single[kept]).tolist():
+        p = nodes[kept[j]]
+        p.ndomr = 1
+        p.domr = dominator[kept[j]]
+        below_dominates = (x[:j] <= x[j]) & (y[:j] <= y[j])
+
+        candidates0 = np.flatnonzero((y[:j] < y[j]) & ~below_dominates)
+        if len(candidates0):
+            p.closest[0] = nodes[kept[candidates0[np.lexsort((y[candidates0], x[candidates0]))[0]]]]
+        else:
+            p.closest[0] = head.next[2]
+        candidates1 = np.flatnonzero((x[:j] < x[j]) & ~below_dominates)
+        if len(candidates1):
+            p.closest[1] = nodes[kept[candidates1[np.lexsort((x[candidates1], y[candidates1]))[0]]]]
+        else:
+            p.closest[1] = head
+        p.cnext[0] = p.closest[0]
+        p.cnext[1] = p.closest[1]
+    return int(single.sum())
+
+# --------------------- Updating Data Structures --------------------------
+
+def setup_z_and_closest(head, new):
+    # Check if new is dominated, find cx and cy of new and where to insert new in the list sorted by z
+    closest1 = head
+    closest0 = head.next[2]
+
+    q = head.next[2].next[2]
+    newx = new.x
+
+    while lexicographic_less(q.x, newx):
+        if q.x[0] <= newx[0] and q.x[1] <= newx[1]:
+            new.ndomr += 1
+            new.domr = q
+        elif q.x[1] < newx[1] and (q.x[0] < closest0.x[0] or (q.x[0] == closest0.x[0] and q.x[1] < closest0.x[1])):
+            closest0 = q
+        elif q.x[0] < newx[0] and (q.x[1] < closest1.x[1] or (q.x[1] == closest1.x[1] and q.x[0] < closest1.x[0])):
+            closest1 = q
+
+        q = q.next[2]
+
+    new.closest[0] = new.cnext[0] = closest0
+    new.closest[1] = new.cnext[1] = closest1
+    new.prev[2] = q.prev[2]
+    new.next[2] = q
+
+
+"""
+Inserts new in the data structure: adds new to the list sorted by z, determines closest[0] and closest[1]
+of new (if determine_insertion_points is True) and updates closest[0] and closest[1] of the points above
+new in z. Points that become dominated by more than one point are removed from the list sorted by z.
+Returns the number of points dominated by new.
+"""
+def add_to_data_structure(head, new, determine_insertion_points=True):
+    if determine_insertion_points:
+        setup_z_and_closest(head, new)
+    add_to_z(new)
+
+    p = new.next[2]
+    stop = head.prev[2]
+    ndom = 0
+    all_delimiters_visited = 0
+    newx = new.x
+
+    while p != stop and all_delimiters_visited < 2:
+        if p.x[0] <= newx[0] and p.x[1] <= newx[1] and (p.x[0] < newx[0] or p.x[1] < newx[1]):
+            all_delimiters_visited += 1
+        elif all_delimiters_visited == 0 or p.ndomr > 0:
+            if newx[0] <= p.x[0]:
+                if newx[1] <= p.x[1]:
+                    p.ndomr += 1
+                    p.domr = new
+                    ndom += 1
+                elif newx[0] < p.x[0] and (newx[1] < p.closest[1].x[1] or (newx[1] == p.closest[1].x[1] and (newx[0] < p.closest[1].x[0] or (newx[0] == p.closest[1].x[0] and newx[2] < p.closest[1].x[2])))):
+                    p.closest[1] = new
+            elif newx[1] < p.x[1] and (newx[0] < p.closest[0].x[0] or (newx[0] == p.closest[0].x[0] and (newx[1] < p.closest[0].x[1] or (newx[1] == p.closest[0].x[1] and newx[2] < p.closest[0].x[2])))):
+                p.closest[0] = new
+
+            if p.ndomr > 1:
+                remove_from_z(p)
+        p = p.next[2]
+
+    return ndom
+
+
+def restart_base(head, stop):
+    # Reconstructs L at z = stop.x[2] (only with the points lexicographically less than stop)
+    p = head.next[2].next[2]
+    restart_list_y(head)
+
+    while p != stop:
+        p.cnext[0] = p.closest[0]
+        p.cnext[1] = p.closest[1]
+        p.cnext[0].cnext[1] = p
+        p.cnext[1].cnext[0] = p
+        p = p.next[2]
+
+
+def update_inserting_points(old, p, di):
+    if p.closest[di] == old:
+        dj = 1 - di
+        if p.x[dj] > old.head[dj].x[dj]:
+            q = old.head[di]
+            while q.x[dj] >= p.x[dj]:
+                q = q.cnext[di]
+            p.closest[di] = q
+        else:
+            p.closest[di] = old.cnext[di]
+        return True
+    return False
+
+
+"""
+Removes old from the data structure: closest[0] and closest[1] of the points above old in z
+that were delimited by old are updated and old is removed from the list sorted by z.
+Assumes that old is nondominated and that no point in the data structure is dominated by old.
+"""
+def remove_from_data_structure(head, old):
+    stop = head.prev[2]
+    restart_base(head, old)
+
+    old.cnext[0] = old.closest[0]
+    old.cnext[1] = old.closest[1]
+    old.head[1] = old.closest[0].cnext[1]
+    old.head[0] = old.closest[1].cnext[0]
+
+    p = old.next[2]
+    while p != stop:
+        if old.x[0] <= p.x[0] and old.x[1] <= p.x[1]:
+            p.ndomr -= 1
+        elif update_inserting_points(old, p, 0):
+            old.cnext[1] = p
+            if p.closest[0].x[1] >= old.x[1]:
+                old.head[0] = p.closest[0]
+            else:
+                old.head[0] = old.cnext[0]
+                old.head[1] = old.cnext[1]
+        elif update_inserting_points(old, p, 1):
+            old.cnext[0] = p
+            if p.closest[1].x[0] >= old.x[0]:
+                old.head[1] = p.closest[1]
+            else:
+                old.head[0] = old.cnext[0]
+                old.head[1] = old.cnext[1]
+        p = p.next[2]
+
+    remove_from_z(old)
+
+# ------------------------- Hypervolume Indicator Algorithms ---------------------------------------
+
+"""Hypervolume in 3-D of the nondominated points in the data structure (dominated points are skipped)"""
+def hv3dplus(head):
+    return hv_plus_hv3dplus(head, remove_dominated=False)
+
+# ------------------------- Hypervolume Contributions in 3-D ---------------------------------------
+
+def setup_nd_point(p):
+    p.cnext[0] = p.closest[0]
+    p.cnext[1] = p.closest[1]
+
+    p.head[1] = p.cnext[0].cnext[1]
+    p.head[0] = p.cnext[1].cnext[0]
+
+def setup_dom_point(p):
+    p.cnext[0] = p.closest[0]
+    p.cnext[1] = p.closest[1]
+
+    domr = p.domr
+    if p.cnext[0].cnext[1] == domr:
+        p.head[1] = domr.head[1]
+    else:
+        p.head[1] = p.cnext[0].cnext[1]
+
+    if p.cnext[1].cnext[0] == domr:
+        p.head[0] = domr.head[0]
+    else:
+        p.head[0] = p.cnext[1].cnext[0]
+
+def update_volume(p, z):
+    p.volume += p.area * (z - p.last_slice_z)
+    p.last_slice_z = z
+
+def update_volume_simple(x, di, u):
+    dj = 1 - di
+    q = u.cnext[dj]
+
+    update_volume(q, x[2])
+    while x[dj] < u.x[dj]:
+        q = u
+        u = u.cnext[di]
+        update_volume(q, x[2])
+    update_volume(u, x[2])
+
+def add_nd_point(p):
+    # Update the 'head's of the neighbours of p only if p is nondominated
+    if p.ndomr == 0:
+        if p.cnext[0].head[1].x[1] >= p.x[1]:
+            p.cnext[0].head[1] = p
+            p.cnext[0].head[0] = p.cnext[0].cnext[0]
+        else:
+            q = p.cnext[0].head[0]
+            while q.x[1] >= p.x[1]:
+                q = q.cnext[0]
+            p.cnext[0].head[0] = q
+            q.cnext[1] = p
+
+        if p.cnext[1].head[0].x[0] >= p.x[0]:
+            p.cnext[1].head[0] = p
+            p.cnext[1].head[1] = p.cnext[1].cnext[1]
+        else:
+            q = p.cnext[1].head[1]
+            while q.x[0] >= p.x[0]:
+                q = q.cnext[1]
+            p.cnext[1].head[1] = q
+            q.cnext[0] = p
+
+    u = p.cnext[0].cnext[1]
+    if u.x[1] > p.x[1] or (u.x[1] == p.x[1] and u.x[0] > p.x[0]):
+        p.cnext[0].cnext[1] = p
+
+    u = p.cnext[1].cnext[0]
+    if u.x[0] > p.x[0] or (u.x[0] == p.x[0] and u.x[1] > p.x[1]):
+        p.cnext[1].cnext[0] = p
+
+def add_dom_point(p):
+    p.head[0] = p.cnext[0]
+    p.head[1] = p.cnext[1]
+
+    if p.cnext[0].cnext[1] == p.domr:
+        p.domr.head[1] = p
+    else:
+        p.cnext[0].cnext[1] = p
+
+    if p.cnext[1].cnext[0] == p.domr:
+        p.domr.head[0] = p
+    else:
+        p.cnext[1].cnext[0] = p
+
+
+"""
+Computes all hypervolume contributions in 3-D in a single sweep of the list sorted by z (HVC3D).
+The contribution of each point is stored in its 'volume' field and the hypervolume is returned.
+If consider_dominated is True, a point dominated by a single point decreases the contribution
+of its dominator, otherwise dominated points are ignored.
+Assumes that preprocessing has been called.
+"""
+def hvc3d_list(head, consider_dominated=False):
+    area = 0
+    volume = 0
+
+    restart_list_y(head)
+    p = head.next[2].next[2]
+    stop = head.prev[2]
+
+    while p != stop:
+        p.area = 0
+        p.volume = 0
+        p.last_slice_z = p.x[2]
+
+        if p.ndomr < 1:
+            setup_nd_point(p)
+
+            update_volume_simple(p.x, 1, p.head[1])
+            p.area = compute_area_simple(p.x, 1, p.cnext[0], p.head[1])
+            area += p.area
+
+            q = p.cnext[0]
+            x = [q.x[0], p.x[1], p.x[2]]  # join(p, q)
+            q.area -= compute_area_simple(x, 0, p.head[1], q.head[0])
+
+            q = p.cnext[1]
+            x = [p.x[0], q.x[1], p.x[2]]
+            q.area -= compute_area_simple(x, 1, p.head[0], q.head[1])
+
+            add_nd_point(p)
+
+        elif consider_dominated and p.ndomr == 1:
+            # The area dominated by p is removed from the area of its single dominator
+            update_volume(p.domr, p.x[2])
+            setup_dom_point(p)
+            p.domr.area -= compute_area_simple(p.x, 1, p.cnext[0], p.head[1])
+
+            add_dom_point(p)
+
+        volume += area * (p.next[2].x[2] - p.x[2])
+        p = p.next[2]
+
+    setup_nd_point(p)
+    update_volume_simple(p.x, 1, p.head[1])
+    return volume
+
+
+def save_contributions(head, d):
+    # Contributions in the order of the history (the input order for the points given to setup_cdllist)
+    if d == 3:
+        return np.array([p.volume for p in history(head)], dtype=float)
+    return np.array([p.hvolume for p in history(head)], dtype=float)
+
+
+"""
+Returns a NumPy array with the hypervolume contributions of the 3-D points (an (n, 3) array or a
+flat list) with respect to ref. Dominated points and points that do not strictly dominate ref contribute 0.
+By default, as in hvc.c, the contributions are computed with respect to the nondominated points only,
+in O(n log n) time: dominated points are ignored, so a point that is the only dominator of another point
+gets more than the hypervolume lost by removing it. If consider_dominated is True, the points dominated
+by a single point decrease the contribution of their dominator (as in hvc4d), which gives the exact
+contributions HV(points) - HV(points without p) (see setup_single_dominators for the time taken).
+"""
+def hvc3d(points, ref, consider_dominated=False):
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    inside = np.all(points < np.asarray(ref[:3], dtype=float), axis=1)
+    contributions = np.zeros(len(points))
+    if not inside.any():
+        return contributions
+
+    head = setup_cdllist_points(points[inside], ref)
+    preprocessing(head, 3)
+    if consider_dominated:
+        setup_single_dominators(head)
+    hvc3d_list(head, consider_dominated)
+    contributions[inside] = save_contributions(head, 3)
+    return contributions
+
+# ------------------------- Updating Hypervolume Contributions in 3-D ---------------------------------------
+
+def join(p1, p2):
+    return [max(p1[0], p2[0]), max(p1[1], p2[1])]
+
+def setup_point(p):
+    p.cnext[0] = p.closest[0]
+    p.cnext[1] = p.closest[1]
+
+    head1 = p.cnext[0].cnext[1]
+    head0 = p.cnext[1].cnext[0]
+
+    if p.ndomr > 0 and head1 == p.domr:
+        head1 = head1.head[1]
+    if p.ndomr > 0 and head0 == p.domr:
+        head0 = head0.head[0]
+
+    p.head[0] = head0
+    p.head[1] = head1
+
+def clear_area_vol(p):
+    p.oldvolume = p.volume
+    p.volume = 0
+    p.area = 0
+
+def compute_area(p, di, l1, l2, u1):
+    dj = 1 - di
+    area = 0
+    lastx = l1.x[dj]
+
+    q = l2
+    while q.x[dj] > p[dj]:
+        area += (lastx - q.x[dj]) * (q.x[di] - p[di])
+        lastx = q.x[dj]
+        q = q.cnext[di]
+
+    area += (lastx - p[dj]) * (min(q.x[di], u1.x[di]) - p[di])
+    return area
+
+def update_dominator_area_vol(p, domr, new, di):
+    dj = 1 - di
+    l2 = p.head[di]
+    pj = join(p.x, new.x)
+
+    area = compute_area(pj, di, p.cnext[dj], l2, p.cnext[di])
+    p.area = area
+    update_volume(domr, p.x[2])
+    domr.area = domr.area - area
+
+def update_dominator_heads(p, domr):
+    if p.x[0] < domr.head[0].x[0] or (p.x[0] == domr.head[0].x[0] and p.x[1] < domr.head[0].x[1]):
+        domr.head[0] = p
+    if p.x[1] < domr.head[1].x[1] or (p.x[1] == domr.head[1].x[1] and p.x[0] < domr.head[1].x[0]):
+        domr.head[1] = p
+
+
+"""
+Updates the (3-D) contribution of q and subtracts from the 2-D contribution of q the area
+dominated by p (the new point that partially dominates the area exclusively dominated by q).
+Coordinate di is used to sweep the points in ascending order.
+"""
+def update_vol_partial_area(p, q, di):
+    area = 0
+    if q.x[2] != float('-inf'):
+        dj = 1 - di
+        update_volume(q, max(p.x[2], q.x[2]))
+
+        pj = join(p.x, q.x)
+        l2 = q.head[di]
+        area = compute_area(pj, di, q.cnext[dj], l2, q.cnext[di])
+        q.area -= area
+
+    return area
+
+# Similar to update_vol_partial_area but computes the area exclusively dominated by p, q and new
+def update_vol_sub_partial_area(p, q, new, di):
+    area = 0
+    if q.x[2] != float('-inf'):
+        dj = 1 - di
+        update_volume(q, max(p.x[2], q.x[2]))
+
+        pj = join(join(p.x, q.x), new.x)
+
+        l2 = q.head[di]
+        if l2.x[di] < pj[di]:
+            while l2.x[di] < pj[di]:
+                l1 = l2
+                l2 = l2.cnext[di]
+        else:
+            l2 = q.head[di]
+            l1 = q.cnext[dj]
+        area = compute_area(pj, di, l1, l2, q.cnext[di])
+        q.area -= area
+
+    return area
+
+def update_existing_areas(new, p, di, adding):
+    dj = 1 - di
+    factor = -1 if adding else 1
+
+    if p.ndomr == 1:
+        domr = p.domr
+        update_dominator_area_vol(p, domr, new, di)
+        update_dominator_heads(p, domr)
+    else:
+        update_vol_sub_partial_area(p, p.cnext[dj], new, dj)
+
+        if p.cnext[dj].x[dj] >= new.x[dj]:
+            q = p.head[di]
+            if q is not None and q.x[2] != float('-inf'):
+                # If p is dominated by new, the sweep stops when an outer delimiter of p is reached
+                maxv = max(new.x[dj], p.x[dj])
+                while maxv <= q.x[dj]:
+                    update_volume(q, p.x[2])
+                    q.volume = q.oldvolume + factor * q.volume
+                    q = q.cnext[di]
+            else:
+                q = p.cnext[di]
+
+            if p.x[dj] >= new.x[dj]:
+                update_vol_sub_partial_area(p, q, new, di)
+            else:
+                update_volume(q, p.x[2])
+                q.volume = q.oldvolume + factor * q.volume
+
+def update_heads(new, p, di):
+    # Assumes that new.cnext[1 - di] = p
+    dj = 1 - di
+
+    if new.head[dj].x[dj] >= p.x[dj]:
+        new.head[dj] = p
+        new.head[di] = new.cnext[di]
+    else:
+        q = new.head[di]
+        while q.x[dj] >= p.x[dj]:
+            q = q.cnext[di]
+
+        new.head[di] = q
+        q.cnext[dj] = p  # to assure that the links of the inner delimiters are correct
+
+def interacts_indirectly(p, new, di):
+    dj = 1 - di
+    next = new.cnext[dj]
+
+    # p does not interact with new if there are at least two points between them
+    if p.x[dj] >= next.cnext[dj].x[dj]:
+        return False
+
+    q = next.head[di]
+    h = q
+    while q.x[dj] >= p.x[dj] and q.x[di] <= new.x[di]:
+        h = q
+        q = q.cnext[di]
+
+    if q.x[di] > new.x[di]:
+        h.cnext[dj] = next.head[di].cnext[dj]
+        next.head[di] = h
+        return True
+    return False
+
+def reconstruct_point(p):
+    # Adds p to L while reconstructing L, including the inner delimiters of each point in L
+    p.cnext[0] = p.closest[0]
+    p.cnext[1] = p.closest[1]
+
+    if p.ndomr == 0:
+        p.head[0] = p.cnext[1].cnext[0]
+        p.head[1] = p.cnext[0].cnext[1]
+
+        p.cnext[0].cnext[1] = p
+        p.cnext[1].cnext[0] = p
+
+        update_heads(p.cnext[0], p, 0)
+        update_heads(p.cnext[1], p, 1)
+    else:
+        p.head[0] = p.cnext[0]
+        p.head[1] = p.cnext[1]
+
+        if p.domr.cnext[1] == p.cnext[1]:
+            p.domr.head[0] = p
+        else:
+            p.cnext[1].cnext[0] = p
+        if p.domr.cnext[0] == p.cnext[0]:
+            p.domr.head[1] = p
+        else:
+            p.cnext[0].cnext[1] = p
+
+def restart_contributions_base(head, stop):
+    # Reconstructs L at z = stop.x[2] (only with the points lexicographically less than stop)
+    p = head.next[2].next[2]
+    restart_list_y(head)
+
+    while p != stop:
+        reconstruct_point(p)
+        p = p.next[2]
+
+def restart_base_setup_z_and_closest(head, new):
+    # Does what setup_z_and_closest does while reconstructing L at z = new.x[2]
+    p = head.next[2].next[2]
+    closest1 = head
+    closest0 = head.next[2]
+    newx = new.x
+
+    restart_list_y(head)
+    while lexicographic_less(p.x, newx):
+        if p.ndomr <= 1:
+            reconstruct_point(p)
+
+            if p.x[0] <= newx[0] and p.x[1] <= newx[1]:
+                new.ndomr += 1
+                new.domr = p
+            elif p.x[1] < newx[1] and (p.x[0] < closest0.x[0] or (p.x[0] == closest0.x[0] and p.x[1] < closest0.x[1])):
+                closest0 = p
+            elif p.x[0] < newx[0] and (p.x[1] < closest1.x[1] or (p.x[1] == closest1.x[1] and p.x[0] < closest1.x[0])):
+                closest1 = p
+        else:
+            p.prev[2].next[2] = p.next[2]
+            p.next[2].prev[2] = p.prev[2]
+
+        p = p.next[2]
+
+    new.closest[0] = closest0
+    new.closest[1] = closest1
+    new.prev[2] = p.prev[2]
+    new.next[2] = p
+
+def add_point(p):
+    # Updates the heads of the neighbours of p (only for nondominated points)
+    if p.ndomr == 0:
+        q = p.cnext[0].head[0]
+        while q.x[1] >= p.x[1]:
+            q = q.cnext[0]
+
+        p.cnext[0].head[0] = q
+        if q.x[1] >= p.cnext[0].x[1]:
+            q.cnext[1] = p
+        else:
+            p.cnext[0].head[1] = p
+
+        q = p.cnext[1].head[1]
+        while q.x[0] >= p.x[0]:
+            q = q.cnext[1]
+
+        p.cnext[1].head[1] = q
+        if q.x[0] >= p.cnext[1].x[0]:
+            q.cnext[0] = p
+        else:
+            p.cnext[1].head[0] = p
+
+    u = p.cnext[0].cnext[1]
+    if u.x[1] > p.x[1] or (u.x[1] == p.x[1] and u.x[0] > p.x[0]):
+        p.cnext[0].cnext[1] = p
+
+    u = p.cnext[1].cnext[0]
+    if u.x[0] > p.x[0] or (u.x[0] == p.x[0] and u.x[1] > p.x[1]):
+        p.cnext[1].cnext[0] = p
+
+def restart_covered_areas(new):
+    # Computes the area dominated by every delimiter of new's contribution in L and by new
+    q = new.cnext[0]
+
+    # right outer delimiter
+    if q.x[2] != float('-inf'):
+        clear_area_vol(q)
+        pj = [q.x[0], new.x[1]]
+        q.area = compute_area(pj, 0, q.cnext[1], q.head[0], q.cnext[0])
+        q.last_slice_z = new.x[2]
+    q = q.cnext[1]
+
+    # inner delimiters
+    while new.x[0] <= q.x[0] and new.x[1] <= q.x[1]:
+        clear_area_vol(q)
+        q.area = compute_area(q.x, 1, q.cnext[0], q.head[1], q.cnext[1])
+        q.last_slice_z = new.x[2]
+        q.domr = new
+        q = q.cnext[1]
+
+    # left outer delimiter
+    if q.x[2] != float('-inf'):
+        clear_area_vol(q)
+        pj = [new.x[0], q.x[1]]
+        q.area = compute_area(pj, 1, q.cnext[0], q.head[1], q.cnext[1])
+        q.last_slice_z = new.x[2]
+
+def add_point_no_heads(p):
+    # Updates L only (the heads of the outer delimiters of p are not updated), assumes p is nondominated
+    p.head[0] = p.cnext[0]
+    p.head[1] = p.cnext[1]
+
+    p.cnext[0].cnext[1] = p
+    p.cnext[1].cnext[0] = p
+
+def increment_slicing(new, p):
+    # Continues the sweep from p (the first point above new in z) and updates the contribution of new
+    while p.x[0] > new.x[0] or p.x[1] > new.x[1]:
+        if new.x[0] <= p.x[0] and new.x[1] <= p.x[1]:
+            if p.ndomr == 0 or (p.domr.x[1] <= new.x[1] and p.domr.x[0] <= new.x[0]):
+                setup_point(p)
+                area = compute_area(p.x, 1, p.cnext[0], p.head[1], p.cnext[1])
+                p.area = area
+
+                update_volume(new, p.x[2])
+                new.area -= area
+                add_point_no_heads(p)
+
+                update_dominator_heads(p, new)
+
+        elif p.x[1] < new.x[1] and p.x[0] > new.x[0] and (p.x[0] < new.cnext[0].x[0] or (p.x[0] == new.cnext[0].x[0] and p.x[1] < new.cnext[0].x[1])):
+            p.cnext[1] = p.closest[1]
+
+            update_vol_partial_area(p, new, 1)
+            new.cnext[0] = p
+            update_heads(new, p, 1)
+
+            p.cnext[1] = new.head[1]
+            p.cnext[1].cnext[0] = p
+
+        elif p.x[0] < new.x[0] and p.x[1] > new.x[1] and (p.x[1] < new.cnext[1].x[1] or (p.x[1] == new.cnext[1].x[1] and p.x[0] < new.cnext[1].x[0])):
+            p.cnext[0] = p.closest[0]
+
+            update_vol_partial_area(p, new, 0)
+            new.cnext[1] = p
+            update_heads(new, p, 0)
+
+            p.cnext[0] = new.head[0]
+            p.cnext[0].cnext[1] = p
+
+        p = p.next[2]
+
+    update_volume(new, p.x[2])
+
+
+"""
+Updates the contributions (the 'volume' fields) of the points whose contribution changes when new is
+added to (adding=True) or removed from (adding=False) the data structure, sweeping only the points
+below new and the points above new that are delimited by it. Returns the contribution of new.
+When adding, new must not be in the list yet (call add_to_data_structure(head, new, False) afterwards).
+When removing, remove_from_data_structure(head, new) must have been called before.
+"""
+def update_contributions(head, new, adding):
+    if adding:
+        restart_base_setup_z_and_closest(head, new)
+    else:
+        restart_contributions_base(head, new.prev[2].next[2])
+
+    new.cnext[0] = new.closest[0]
+    new.cnext[1] = new.closest[1]
+
+    new.head[1] = new.closest[0].cnext[1]
+    new.head[0] = new.closest[1].cnext[0]
+    new.last_slice_z = new.x[2]
+
+    restart_covered_areas(new)
+    new.volume = 0
+    new.area = compute_area(new.x, 1, new.closest[0], new.closest[0].cnext[1], new.closest[1])
+    p = new.next[2]
+
+    factor = -1 if adding else 1
+
+    while p.x[0] > new.x[0] or p.x[1] > new.x[1]:
+        if p.ndomr <= 1:
+            setup_point(p)
+            update_volume(new, p.x[2])
+
+            if new.x[0] <= p.x[0] and new.x[1] <= p.x[1]:
+                clear_area_vol(p)
+                p.last_slice_z = p.x[2]
+                if p.ndomr == 0:
+                    update_dominator_area_vol(p, new, new, 1)
+                    update_dominator_heads(p, new)
+                    update_existing_areas(new, p, 0, adding)
+                else:
+                    domr = p.domr
+                    if p.x[1] < domr.cnext[1].x[1] and p.x[0] < domr.cnext[0].x[0]:  # interacts
+                        update_dominator_area_vol(p, domr, new, 1)
+                        update_dominator_heads(p, domr)
+
+            elif p.x[0] > new.x[0]:
+                if p.x[0] < new.cnext[0].x[0] or (p.x[0] == new.cnext[0].x[0] and p.x[1] < new.cnext[0].x[1]):
+                    clear_area_vol(p)
+                    p.last_slice_z = p.x[2]
+                    p.area = update_vol_partial_area(p, new, 1)
+
+                    update_existing_areas(new, p, 0, adding)
+                    update_heads(new, p, 1)
+                    new.cnext[0] = p
+
+                elif interacts_indirectly(p, new, 1):
+                    update_existing_areas(new, p, 0, adding)
+
+            elif p.x[1] > new.x[1]:
+                if p.x[1] < new.cnext[1].x[1] or (p.x[1] == new.cnext[1].x[1] and p.x[0] < new.cnext[1].x[0]):
+                    clear_area_vol(p)
+                    p.last_slice_z = p.x[2]
+                    p.area = update_vol_partial_area(p, new, 0)
+                    update_existing_areas(new, p, 1, adding)
+                    update_heads(new, p, 0)
+                    new.cnext[1] = p
+
+                elif interacts_indirectly(p, new, 0):
+                    update_existing_areas(new, p, 1, adding)
+
+            # update L (the list of nondominated points in 2-D)
+            add_point(p)
+        p = p.next[2]
+
+    update_volume(new, p.x[2])
+
+    q = new.cnext[0]
+    while q.x[0] >= new.x[0]:
+        update_volume(q, p.x[2])
+        q.volume = q.oldvolume + factor * q.volume
+        q = q.cnext[1]
+    update_volume(q, p.x[2])
+    if q.x[2] != float('inf'):
+        q.volume = q.oldvolume + factor * q.volume
+
+    if p.next[2] != head:
+        volume = new.volume
+        new.volume = 0
+
+        new.last_slice_z = p.x[2]
+        increment_slicing(new, p.next[2])
+        p.volume = p.volume + factor * new.volume
+        new.volume = volume
+
+    return new.volume
+
+
+"""
+Returns the indices used by remove_updating_neighbours: the points of the list sorted by z in two
+sorted lists, one sorted by x (ties broken by y) and one sorted by y (ties broken by x).
+Assumes that the points in the list are mutually nondominated.
+"""
+def setup_xy_indices(head):
+    nodes = []
+    p = head.next[2].next[2]
+    stop = head.prev[2]
+    while p != stop:
+        nodes.append(p)
+        p = p.next[2]
+    return (SortedKeyList(nodes, key=lambda node: (node.x[0], node.x[1])),
+            SortedKeyList(nodes, key=lambda node: (node.x[1], node.x[0])))
+
+def delimiters_window(head, old, i, index, upper):
+    # Points with old.x[i] < x[i] <= upper[i], where upper[i] is lowered to the second smallest x[i] of the points
+    # that dominate old in the other two coordinates (at and above it, the points are dominated twice)
+    j = 1 - i if i < 2 else 0
+    k = 3 - i - j
+    xi, xj, xk = old.x[i], old.x[j], old.x[k]
+    limit = upper[i]
+    window = []
+    found = 0
+    if i < 2:
+        points = index[i].irange_key(min_key=(xi, float('inf')), inclusive=(False, False))
+    else:
+        points = iter_z(head, old)
+    for q in points:
+        y = q.x
+        if y[i] > limit:
+            break
+        if y[i] > xi:
+            window.append(q)
+            if y[j] <= xj and y[k] <= xk:
+                found += 1
+                if found == 2:
+                    limit = y[i]
+    upper[i] = limit
+    return window
+
+def small_exact_contributions(points, ref):
+    # Exact contributions (dominated points included) of a few 3-D points, in the input order: the points are
+    # added one by one in the order of z, as in hvc4d_list_r, and are swept once by hvc3d_list, in O(n^2) time
+    nodes = [HVCNode() for _ in range(len(points) + 3)]
+    head = init_sentinels(nodes[:3], ref, 3)
+    for p, x in zip(nodes[3:], points):
+        point2struct(head, p, x, 3)
+    for p in sorted(nodes[3:], key=lambda node: (node.x[2], node.x[1], node.x[0])):
+        add_to_data_structure(head, p)
+    hvc3d_list(head, True)
+    return [p.volume for p in nodes[3:]]
+
+def iter_z(head, old):
+    # Points above old in the list sorted by z
+    p = old.next[2]
+    stop = head.prev[2]
+    while p != stop:
+        yield p
+        p = p.next[2]
+
+def first_below(p, i, index, old):
+    # The point with the smallest (x[i], x[1 - i]) after old in index[i] that comes before p in z and has
+    # a smaller coordinate 1 - i than p, i.e. the new closest[i] of p once old is removed
+    j = 1 - i
+    for q in index[i].irange_key(min_key=(old.x[i], old.x[j]), inclusive=(False, False)):
+        if q.x[j] < p.x[j] and lexicographic_less(q.x, p.x):
+            return q
+    return None
+
+
+"""
+Removes old from the data structure and adds to the contribution (the 'volume' field) of every other point
+the volume that becomes exclusively dominated by it, without sweeping the whole list. This volume lies in the
+box between old and the upper corner u, where u[i] is the second smallest coordinate i of the points that
+dominate old in the other two coordinates (above u[i] every point is dominated twice), so only the points
+that dominate u are looked at: they are found in the windows between old and u of index (see setup_xy_indices)
+and of the list sorted by z. The volumes are the exact contributions of the joins of old with these points,
+with respect to u (see small_exact_contributions), and closest[0] and closest[1] of the points delimited
+by old are updated as in remove_from_data_structure. The time taken depends on the number of points in the
+windows instead of the number of points in the list. Assumes that the points are mutually nondominated and
+that their contributions are up to date. old is also removed from index. Returns the contribution of old.
+"""
+def remove_updating_neighbours(head, old, index):
+    upper = [head.next[2].x[0], head.x[1], head.prev[2].x[2]]  # the reference point
+    windows = [delimiters_window(head, old, i, index, upper) for i in range(3)]
+
+    u0, u1, u2 = upper
+    neighbours = {}
+    for window in windows:
+        for q in window:
+            y = q.x
+            if y[0] < u0 and y[1] < u1 and y[2] < u2:
+                neighbours[id(q)] = q
+    if neighbours:
+        neighbours = list(neighbours.values())
+        x = old.x
+        joins = [[max(x[0], q.x[0]), max(x[1], q.x[1]), max(x[2], q.x[2])] for q in neighbours]
+        for q, volume in zip(neighbours, small_exact_contributions(joins, upper)):
+            q.volume += volume
+
+    # The points above old delimited by it have larger y (closest[0]) or larger x (closest[1]) than old
+    for i in (0, 1):
+        for p in windows[1 - i]:
+            if p.closest[i] is old:
+                q = first_below(p, i, index, old)
+                p.closest[i] = q if q is not None else (head.next[2] if i == 0 else head)
+
+    index[0].remove(old)
+    index[1].remove(old)
+    remove_from_z(old)
+    return old.volume
+
+# ------------------------- Hypervolume Contributions in 4-D ---------------------------------------
+
+"""
+Computes all hypervolume contributions in 4-D by computing all contributions in 3-D (hvc3d_list)
+in each slice along w (HVC4D-R). The contribution of each point is stored in its 'hvolume' field
+and the hypervolume is returned. Runs in O(n^2) time.
+"""
+def hvc4d_list_r(head):
+    hv = 0
+    last = head.prev[3]
+    new = head.next[3].next[3]
+    stop = head.prev[2]
+
+    while new != last:
+        add_to_data_structure(head, new, True)
+
+        volume = hvc3d_list(head, True)  # hypervolume and contributions in 3-D, in linear time
+        height = new.next[3].x[3] - new.x[3]
+        p = head.next[2].next[2]
+        while p != stop:
+            p.hvolume += p.volume * height
+            p = p.next[2]
+
+        hv += volume * height
+        new = new.next[3]
+
+    return hv
+
+"""
+Returns a NumPy array with the hypervolume contributions of the 4-D points (an (n, 4) array or a
+flat list) with respect to ref, computed in O(n^2) time (HVC4D-R, see hvc4d_list_r).
+Dominated points and points that do not strictly dominate ref contribute 0.
+"""
+def hvc4d(points, ref):
+    points = np.asarray(points, dtype=float).reshape(-1, 4)
+    inside = np.all(points < np.asarray(ref[:4], dtype=float), axis=1)
+    contributions = np.zeros(len(points))
+    if not inside.any():
+        return contributions
+
+    head = setup_cdllist_points(points[inside], ref)
+    hvc4d_list_r(head)
+    contributions[inside] = save_contributions(head, 4)
+    return contributions
+
+# ------------------------- Greedy Hypervolume Subset Selection ---------------------------------------
+
+def least_contributor(head, d):
+    # Returns the point with the smallest contribution (in 3-D, dominated points first)
+    p = head.next[d - 1].next[d - 1]
+    stop = head.prev[d - 1]
+    least_contribution = float('inf')
+    lcontributor = None
+
+    while p != stop:
+        contribution = p.volume if d == 3 else p.hvolume
+        if (d == 3 and p.ndomr > 0) or contribution < least_contribution:
+            least_contribution = contribution
+            lcontributor = p
+        p = p.next[d - 1]
+
+    return lcontributor
+
+
+"""
+Decremental greedy hypervolume subset selection in 3-D (gHSSD3D): the point with the smallest
+contribution is removed until k points are left. Assumes that the points in the list are mutually
+nondominated and that hvc3d_list has been called. If recompute is False, only the contributions
+that change are updated after each removal (update_contributions), otherwise all contributions are
+recomputed (hvc3d_list). Returns the ids of the points in the order in which they were removed,
+their contributions at the time of removal and the hypervolume of the remaining points.
+"""
+def ghssd_3d(head, n, k, hv, recompute=False):
+    removed = []
+    contributions = []
+
+    for _ in range(n - k):
+        lcontributor = least_contributor(head, 3)
+        removed.append(lcontributor.id)
+        contributions.append(lcontributor.volume)
+
+        hv -= lcontributor.volume
+        remove_from_data_structure(head, lcontributor)
+        if recompute:
+            hv = hvc3d_list(head, False)
+        else:
+            update_contributions(head, lcontributor, False)
+        remove_from_history(lcontributor)
+
+    return removed, contributions, hv
+
+
+"""
+Greedy hypervolume subset selection (decremental): starting from all points (an (n, d) array with
+d = 3 or 4), the point with the smallest contribution is repeatedly removed until k points are left.
+Dominated points (and points that do not strictly dominate ref) are removed first.
+Returns the indices of the k selected points and their contributions to the selected subset
+(as in hvc3d, dominated points are ignored in the contributions in 3-D).
+In 3-D, the contributions are updated after each removal and the selection runs in O(n^2) time
+(as gHSSD in hvc.c). In 4-D, all contributions are recomputed after each removal (hvc4d_list_r),
+which takes O((n - k) n^2) time.
+"""
+def greedy_hv_subset(points, k, ref, recompute=False):
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    if not 0 <= k <= n:
+        raise ValueError("k must be between 0 and the number of points")
+    inside = np.all(points < np.asarray(ref[:d], dtype=float), axis=1)
+    indices = np.flatnonzero(inside)
+    outside = np.flatnonzero(~inside)
+
+    if d == 3:
+        head = setup_cdllist_points(points[indices], ref)
+        preprocessing(head, 3)
+        # Dominated points contribute 0 and are removed before the nondominated ones
+        dominated = [p for p in history(head) if p.ndomr > 0]
+        for p in dominated:
+            remove_from_z(p)
+            remove_from_history(p)
+        m = len(indices) - len(dominated)
+
+        hv = hvc3d_list(head, False)
+        removed, _, hv = ghssd_3d(head, m, min(k, m), hv, recompute)
+        kept = [p.id for p in history(head)]
+        contributions = [p.volume for p in history(head)]
+        discarded = list(outside) + list(indices[[p.id for p in dominated]]) + list(indices[removed])
+
+    elif d == 4:
+        kept = list(range(len(indices)))
+        while len(kept) > k:
+            head = setup_cdllist_points(points[indices[kept]], ref)
+            hvc4d_list_r(head)
+            lcontributor = least_contributor(head, 4)
+            kept.pop(lcontributor.id)
+        if kept:
+            head = setup_cdllist_points(points[indices[kept]], ref)
+            hvc4d_list_r(head)
+            contributions = [p.hvolume for p in history(head)]
+        else:
+            contributions = []
+        discarded = list(outside)
+
+    else:
+        raise ValueError("only 3-D and 4-D points are supported")
+
+    selected = list(indices[kept])
+    # If k is larger than the number of nondominated points, the last discarded points are selected
+    while len(selected) < k:
+        selected.append(discarded.pop())
+        contributions.append(0.0)
+
+    return np.array(selected, dtype=int), np.array(contributions, dtype=float)
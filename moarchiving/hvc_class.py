@@ -0,0 +1,647 @@
+import heapq
+import numpy as np
+from hvc import HVCNode, setup_cdllist_points, preprocessing, clear_point, history, add_to_history, remove_from_history
+from hvc import add_to_data_structure, remove_from_data_structure, one_contribution_3d, hv3dplus, hvc3d_list, update_contributions
+from hvc import setup_xy_indices, remove_updating_neighbours
+import hv_plus
+from hv_plus import remove_from_z, setup_z_below
+
+"""
+Python version of hvc-class.c (related/HVC-master): an archive of mutually nondominated 3-D points whose
+hypervolume is updated in O(n) time each time a point is added or removed.
+"""
+
+class HV3DArchive:
+    """
+    Archive of mutually nondominated points in 3-D (minimization) with respect to the reference point ref.
+
+    The nodes of the data structure are used as handles: add_point returns the node of the new point,
+    which can later be passed to remove, so that the point is removed without searching for it.
+    A point that is weakly dominated by a point in the archive (or does not strictly dominate the
+    reference point) is not added, and the points dominated by a new point are removed from the archive.
+
+    The contributions of the points are computed the first time they are needed (for example, by
+    get_contributions or remove_least_contributor) and are then kept up to date: when a point is added,
+    only the contributions that change are updated (update_contributions), in O(n) time, and when a point
+    is removed, only the points that delimit its contribution are looked at (remove_updating_neighbours),
+    which are found in the points sorted by x and by y (kept while the contributions are up to date).
+    The least contributor is kept in a priority queue. Since removing a point can only increase the
+    contributions of the remaining points, outdated entries of the queue are updated lazily, when
+    they reach the top of the queue.
+    """
+
+    def __init__(self, points=None, ref=None):
+        if ref is None:
+            raise ValueError("the reference point must be given")
+        self.ref = list(ref[:3])
+        if points is None or len(points) == 0:
+            points = np.empty((0, 3))
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        points = points[np.all(points < self.ref, axis=1)]
+
+        self.list = setup_cdllist_points(points, self.ref)
+        ndom = preprocessing(self.list, 3)
+        if ndom > 0:
+            # Dominated points are removed from the archive
+            for p in history(self.list):
+                if p.ndomr > 0:
+                    self._discard(p)
+        self.n = len(points) - ndom
+        self.next_id = len(points)
+        self.hv = hv3dplus(self.list)
+        self.updated = False  # whether the contributions are up to date
+        self.index = None  # the points sorted by x and by y (see setup_xy_indices), while updated is True
+        self.heap = None  # priority queue of (contribution, counter, node), None if it must be rebuilt
+        self.counter = 0
+        self.outside = []  # points removed by change_reference_point, restored when they are inside again
+
+    def _discard(self, p):
+        remove_from_z(p)
+        remove_from_history(p)
+        p.id = -1
+
+    def add_point(self, point):
+        """
+        Adds point to the archive and returns its handle or None if the point was not added.
+        """
+        x = [float(v) for v in point[:3]]
+        if not all(v < r for v, r in zip(x, self.ref)):
+            return None
+        return self._insert(HVCNode(x))
+
+    def _insert(self, new):
+        # Adds the node new (inside the reference box) to the archive, returns None if it is dominated
+        x = new.x
+        clear_point(self.list, new)
+        contribution = one_contribution_3d(self.list, new)
+        if new.ndomr > 0:
+            return None
+
+        # Remove the points dominated by new (they all come after new in z)
+        p = new.next[2]
+        stop = self.list.prev[2]
+        while p != stop:
+            q = p.next[2]
+            if x[0] <= p.x[0] and x[1] <= p.x[1]:
+                if self.updated:
+                    remove_updating_neighbours(self.list, p, self.index)
+                else:
+                    remove_from_data_structure(self.list, p)
+                remove_from_history(p)
+                p.id = -1
+                self.n -= 1
+            p = q
+
+        clear_point(self.list, new)
+        if self.updated:
+            update_contributions(self.list, new, True)
+            add_to_data_structure(self.list, new, False)
+            self.index[0].add(new)
+            self.index[1].add(new)
+        else:
+            add_to_data_structure(self.list, new)
+        add_to_history(self.list, new)
+        self.heap = None  # contributions may have decreased
+        new.id = self.next_id
+        self.next_id += 1
+        self.n += 1
+        self.hv += contribution
+        return new
+
+    def remove(self, handle):
+        """
+        Removes the point with the given handle (as returned by add_point or get_handles) from the archive.
+        Returns False if the point is not (or no longer) in the archive.
+        """
+        if handle.id < 0:
+            return False
+        if self.updated:
+            contribution = remove_updating_neighbours(self.list, handle, self.index)
+        else:
+            remove_from_data_structure(self.list, handle)
+        remove_from_history(handle)
+        handle.id = -1
+        self.n -= 1
+
+        if self.n == 0:
+            self.hv = 0
+        elif self.updated:
+            self.hv -= contribution
+        else:
+            handle.ndomr = 0
+            self.hv -= one_contribution_3d(self.list, handle)
+        return True
+
+    def remove_point(self, point):
+        """Removes the point equal to point from the archive. Returns False if there is no such point."""
+        x = [float(v) for v in point[:3]]
+        p = self.list.next[0]
+        while p != self.list:
+            if p.x[:3] == x:
+                return self.remove(p)
+            p = p.next[0]
+        return False
+
+    def remove_point_at(self, i):
+        """Removes the i-th point in the order in which the points were added"""
+        if not 0 <= i < self.n:
+            raise IndexError("archive index out of range")
+        return self.remove(history(self.list)[i])
+
+    def update_all_contributions(self):
+        # Computes all contributions from scratch (HVC3D), in O(n) time
+        if not self.updated:
+            self.hv = hvc3d_list(self.list, False)
+            self.index = setup_xy_indices(self.list)
+            self.updated = True
+            self.heap = None
+
+    def get_contributions(self):
+        """Contributions of the points in the order in which they were added"""
+        self.update_all_contributions()
+        return np.array([p.volume for p in history(self.list)], dtype=float)
+
+    def get_least_contributor(self):
+        """Returns the handle of the point with the smallest contribution (None if the archive is empty)"""
+        if self.n == 0:
+            return None
+        self.update_all_contributions()
+        if self.heap is None or len(self.heap) > 4 * self.n + 16:
+            self.heap = [(p.volume, i, p) for i, p in enumerate(history(self.list))]
+            heapq.heapify(self.heap)
+            self.counter = len(self.heap)
+
+        while True:
+            volume, _, p = self.heap[0]
+            if p.id < 0:
+                heapq.heappop(self.heap)
+            elif p.volume != volume:
+                # the contribution of p has increased since the entry was added
+                heapq.heapreplace(self.heap, (p.volume, self.counter, p))
+                self.counter += 1
+            else:
+                return p
+
+    def get_least_contributor_index(self):
+        """Index of the least contributor in the order in which the points were added (-1 if empty)"""
+        p = self.get_least_contributor()
+        if p is None:
+            return -1
+        return history(self.list).index(p)
+
+    def remove_least_contributor(self):
+        """Removes the point with the smallest contribution and returns its handle"""
+        p = self.get_least_contributor()
+        if p is not None:
+            self.remove(p)
+        return p
+
+    def change_reference_point(self, ref):
+        """
+        Changes the reference point to ref without rebuilding the data structure. The points that do not
+        strictly dominate ref are removed from the archive and kept aside, and the points kept aside that
+        strictly dominate ref again are added back (unless they are dominated by the current points).
+        """
+        ref = [float(r) for r in ref[:3]]
+        updated = self.updated
+        self.updated = False  # the contributions are recomputed below
+        self.heap = None
+        for p in history(self.list):
+            if not all(v < r for v, r in zip(p.x, ref)):
+                remove_from_data_structure(self.list, p)
+                remove_from_history(p)
+                p.id = -1
+                self.n -= 1
+                self.outside.append(p)
+
+        self.ref = ref
+        hv_plus.update_sentinels(self.list, ref, 3)
+        if updated:
+            self.update_all_contributions()
+        else:
+            self.hv = hv3dplus(self.list)
+
+        outside = self.outside
+        self.outside = []
+        for p in outside:
+            if all(v < r for v, r in zip(p.x, ref)):
+                self._insert(p)
+            else:
+                self.outside.append(p)
+
+    def total_hv(self):
+        return self.hv
+
+    def update_hypervolume(self):
+        # Recomputes the hypervolume (and the contributions) from scratch (removes the accumulated rounding errors)
+        if self.updated:
+            self.updated = False
+            self.update_all_contributions()
+        else:
+            self.hv = hv3dplus(self.list)
+        return self.hv
+
+    def get_size(self):
+        return self.n
+
+    def __len__(self):
+        return self.n
+
+    def get_handles(self):
+        """Handles of the points in the order in which they were added"""
+        return history(self.list)
+
+    def get_points(self):
+        """Points in the order in which they were added"""
+        return np.array([p.x[:3] for p in history(self.list)]).reshape(-1, 3)
+
+
+class HV4DArchive:
+    """
+    Archive of mutually nondominated points in 4-D (minimization) with respect to the reference point ref.
+
+    The points are kept in the list sorted by w (next[3]/prev[3]) and each point p stores in p.volume the
+    3-D hypervolume of the slice [p.x[3], p.next[3].x[3]), i.e. of the points up to p in w. Adding or
+    removing a point q does not change the slices below q, so only the slices from q upwards are updated:
+    the list sorted by z of the points below q is set up (in O(n log n) time) and then the points above q
+    are added one at a time, as in hv4dplusU, while the contribution of q to each slice is computed
+    (one_contribution_3d). Since this contribution can only decrease, the update stops at the first
+    slice to which q contributes nothing.
+
+    As in HV3DArchive, add_point returns the node of the new point, which can be used as a handle, a point
+    that is weakly dominated is not added and the points dominated by a new point are removed.
+    """
+
+    def __init__(self, points=None, ref=None):
+        if ref is None:
+            raise ValueError("the reference point must be given")
+        self.ref = list(ref[:4])
+        if points is None or len(points) == 0:
+            points = np.empty((0, 4))
+        points = np.asarray(points, dtype=float).reshape(-1, 4)
+        points = points[np.all(points < self.ref, axis=1)]
+
+        self.list = setup_cdllist_points(points, self.ref)
+        self.n = len(points)
+        self.next_id = len(points)
+        self.outside = []  # points removed by change_reference_point, restored when they are inside again
+        self.update_hypervolume()
+
+    def _discard(self, p):
+        p.prev[3].next[3] = p.next[3]
+        p.next[3].prev[3] = p.prev[3]
+        remove_from_history(p)
+        p.id = -1
+        self.n -= 1
+
+    def update_hypervolume(self):
+        # Recomputes the volumes of all slices (and the hypervolume) from scratch, as in hv4dplusU,
+        # and removes the dominated points
+        head = self.list
+        self._setup_z(head.next[3].next[3])
+        volume = 0
+        p = head.next[3].next[3]
+        while p != head.prev[3]:
+            q = p.next[3]
+            hv_plus.clear_point(head, p)
+            volume += hv_plus.one_contribution_3d(head, p)
+            if p.ndomr > 0:
+                self._discard(p)
+            else:
+                hv_plus.add_to_z(p)
+                hv_plus.update_links(head, p, p.next[2])
+                p.volume = volume
+            p = q
+        self.hv = self._slices_hv(head.next[3].next[3])
+        return self.hv
+
+    def _slices_hv(self, p):
+        hv = 0
+        while p != self.list.prev[3]:
+            hv += p.volume * (p.next[3].x[3] - p.x[3])
+            p = p.next[3]
+        return hv
+
+    def _setup_z(self, stop):
+        setup_z_below(self.list, stop)
+
+    def _update_slices(self, q, factor):
+        # Adds (factor = 1) or subtracts (factor = -1) the contributions of q (not in the list sorted
+        # by z, but in the list sorted by w) to the slices from q upwards. Assumes that the list sorted
+        # by z has been set up with the points below q.
+        head = self.list
+        last = head.prev[3]
+        hv = 0
+        q.volume = q.prev[3].volume  # the sentinel head.next[3] has volume 0
+        q.ndomr = 0
+        contribution = hv_plus.one_contribution_3d(head, q)
+        q.volume += contribution
+        hv += contribution * (q.next[3].x[3] - q.x[3])
+
+        p = q.next[3]
+        while p != last and contribution > 0:
+            hv_plus.clear_point(head, p)
+            hv_plus.setup_z_and_closest(head, p)
+            if p.ndomr < 1:
+                # the contribution of q changes only if the list sorted by z changes
+                hv_plus.add_to_z(p)
+                hv_plus.update_links(head, p, p.next[2])
+                q.ndomr = 0
+                contribution = hv_plus.one_contribution_3d(head, q)
+            p.volume += factor * contribution
+            hv += contribution * (p.next[3].x[3] - p.x[3])
+            p = p.next[3]
+        self.hv += factor * hv
+
+    def add_point(self, point):
+        """
+        Adds point to the archive and returns its handle or None if the point was not added.
+        """
+        x = [float(v) for v in point[:4]]
+        if not all(v < r for v, r in zip(x, self.ref)):
+            return None
+        return self._insert(HVCNode(x))
+
+    def _insert(self, new):
+        # Adds the node new (inside the reference box) to the archive, returns None if it is dominated
+        x = new.x
+        head = self.list
+
+        # the new point is inserted after the points that are lexicographically less or equal in (w, z, y, x)
+        key = x[::-1]
+        t = head.next[3].next[3]
+        while t != head.prev[3] and t.x[::-1] <= key:
+            t = t.next[3]
+
+        self._setup_z(t)
+        hv_plus.clear_point(head, new)
+        hv_plus.one_contribution_3d(head, new)
+        if new.ndomr > 0:
+            return None
+
+        new.prev[3] = t.prev[3]
+        new.next[3] = t
+        t.prev[3].next[3] = new
+        t.prev[3] = new
+        self._update_slices(new, 1)
+
+        # Remove the points dominated by new (they all come after new in w)
+        p = new.next[3]
+        while p != head.prev[3]:
+            q = p.next[3]
+            if x[0] <= p.x[0] and x[1] <= p.x[1] and x[2] <= p.x[2]:
+                self._discard(p)
+            p = q
+
+        add_to_history(head, new)
+        new.id = self.next_id
+        self.next_id += 1
+        self.n += 1
+        return new
+
+    def remove(self, handle):
+        """
+        Removes the point with the given handle (as returned by add_point or get_handles) from the archive.
+        Returns False if the point is not (or no longer) in the archive.
+        """
+        if handle.id < 0:
+            return False
+        self._setup_z(handle)
+        self._update_slices(handle, -1)
+        self._discard(handle)
+        if self.n == 0:
+            self.hv = 0
+        return True
+
+    def remove_point(self, point):
+        """Removes the point equal to point from the archive. Returns False if there is no such point."""
+        x = [float(v) for v in point[:4]]
+        p = self.list.next[0]
+        while p != self.list:
+            if p.x[:4] == x:
+                return self.remove(p)
+            p = p.next[0]
+        return False
+
+    def remove_point_at(self, i):
+        """Removes the i-th point in the order in which the points were added"""
+        if not 0 <= i < self.n:
+            raise IndexError("archive index out of range")
+        return self.remove(history(self.list)[i])
+
+    def change_reference_point(self, ref):
+        """
+        Changes the reference point to ref without rebuilding the list sorted by w (see
+        HV3DArchive.change_reference_point). If only the fourth coordinate changes, the volumes of the
+        slices are kept and only the hypervolume is summed again (O(n)). Otherwise the 3-D hypervolume of
+        every slice changes and all slices are recomputed as in hv4dplusU (O(n^2), the list sorted by w
+        is not sorted again).
+        """
+        ref = [float(r) for r in ref[:4]]
+        for p in history(self.list):
+            if not all(v < r for v, r in zip(p.x, ref)):
+                self._discard(p)
+                self.outside.append(p)
+
+        slices_kept = ref[:3] == self.ref[:3]
+        self.ref = ref
+        hv_plus.update_sentinels(self.list, ref, 4)
+        if slices_kept:
+            # the points that left the box were the last ones in w, the slices below them do not change
+            self.hv = self._slices_hv(self.list.next[3].next[3])
+        else:
+            self.update_hypervolume()
+
+        outside = self.outside
+        self.outside = []
+        for p in outside:
+            if all(v < r for v, r in zip(p.x, ref)):
+                self._insert(p)
+            else:
+                self.outside.append(p)
+
+    def total_hv(self):
+        return self.hv
+
+    def get_size(self):
+        return self.n
+
+    def __len__(self):
+        return self.n
+
+    def get_handles(self):
+        """Handles of the points in the order in which they were added"""
+        return history(self.list)
+
+    def get_points(self):
+        """Points in the order in which they were added"""
+        return np.array([p.x[:4] for p in history(self.list)]).reshape(-1, 4)
+
+
+def _no_area(p, di, s, u):
+    return 0
+
+
+class HVDeltaTracker:
+    """
+    Hypervolume of a population of 3-D or 4-D points (minimization, dominated points allowed) that is
+    tracked from one generation to the next by applying the difference between the populations.
+
+    The nodes are kept in the list sorted by the last coordinate between generations, so update only
+    unlinks the removed nodes and merges the added points (sorted among themselves) into the list with
+    a single walk, instead of sorting and setting up the whole population again. In 3-D, the hypervolume
+    is then recomputed with one sweep in z (preprocessing and sweep_3d) from the lowest changed point.
+    In 4-D, each point p keeps in p.volume the 3-D hypervolume of the slice above it (as in HV4DArchive),
+    and only the slices from the lowest changed point upwards are recomputed.
+    Points that do not strictly dominate the reference point are ignored.
+    """
+
+    def __init__(self, points, ref):
+        points = np.asarray(points, dtype=float)
+        self.d = points.shape[1]
+        if self.d not in (3, 4):
+            raise ValueError("only 3-D and 4-D points are supported")
+        self.ref = [float(r) for r in ref[:self.d]]
+        points = points[np.all(points < self.ref, axis=1)]
+
+        self.list = setup_cdllist_points(points, self.ref)
+        self.nodes = {}  # nodes of the population by point (a list, since points may be repeated)
+        for p in history(self.list):
+            self.nodes.setdefault(tuple(p.x[:self.d]), []).append(p)
+        self.n = len(points)
+        self.next_id = len(points)
+        self.hv = 0
+        self._recompute(self.list.next[self.d - 1].next[self.d - 1])
+
+    def _key(self, x):
+        # order of the list sorted by the last coordinate
+        return x[self.d - 1::-1]
+
+    def update(self, added=None, removed=None):
+        """
+        Removes the points in removed and adds the points in added (arrays of shape (k, d)) and returns
+        the new hypervolume. Raises ValueError if a removed point is not in the population.
+        """
+        head = self.list
+        di = self.d - 1
+        lowest = None  # key of the lowest changed point
+
+        if removed is not None:
+            for x in np.asarray(removed, dtype=float).reshape(-1, self.d).tolist():
+                if not all(v < r for v, r in zip(x, self.ref)):
+                    continue
+                nodes = self.nodes.get(tuple(x))
+                if not nodes:
+                    raise ValueError(f"point {x} is not in the population")
+                p = nodes.pop()
+                if not nodes:
+                    del self.nodes[tuple(x)]
+                p.prev[di].next[di] = p.next[di]
+                p.next[di].prev[di] = p.prev[di]
+                remove_from_history(p)
+                p.id = -1
+                self.n -= 1
+                if lowest is None or self._key(x) < lowest:
+                    lowest = self._key(x)
+
+        if added is not None:
+            added = np.asarray(added, dtype=float).reshape(-1, self.d)
+            added = added[np.all(added < self.ref, axis=1)]
+            t = head.next[di].next[di]
+            for x in added[hv_plus.lexsort_points(added)].tolist():
+                key = self._key(x)
+                while t != head.prev[di] and self._key(t.x) <= key:
+                    t = t.next[di]
+                new = HVCNode(x)
+                new.prev[di] = t.prev[di]
+                new.next[di] = t
+                t.prev[di].next[di] = new
+                t.prev[di] = new
+                add_to_history(head, new)
+                new.id = self.next_id
+                self.next_id += 1
+                self.nodes.setdefault(tuple(x), []).append(new)
+                self.n += 1
+                if lowest is None or key < lowest:
+                    lowest = key
+
+        if lowest is not None:
+            # the first node at or above the lowest change
+            p = head.next[di].next[di]
+            while p != head.prev[di] and self._key(p.x) < lowest:
+                p = p.next[di]
+            self._recompute(p)
+        return self.hv
+
+    def _recompute(self, first):
+        head = self.list
+        if self.d == 3:
+            self._recompute_3d(first)
+            return
+
+        # the slices below first do not change
+        setup_z_below(head, first)
+        last = head.prev[3]
+        p = first
+        volume = p.prev[3].volume  # the sentinel head.next[3] has volume 0
+        while p != last:
+            hv_plus.clear_point(head, p)
+            volume += hv_plus.one_contribution_3d(head, p)
+            if p.ndomr < 1:
+                hv_plus.add_to_z(p)
+                hv_plus.update_links(head, p, p.next[2])
+            p.volume = volume
+            p = p.next[3]
+
+        hv = 0
+        p = head.next[3].next[3]
+        while p != last:
+            hv += p.volume * (p.next[3].x[3] - p.x[3])
+            p = p.next[3]
+        self.hv = hv
+
+    def _recompute_3d(self, first):
+        # Each nondominated point p keeps in p.area the area of the slice above it and in p.volume the
+        # hypervolume below it. The nodes below first keep closest and ndomr, so their staircase in (x, y)
+        # is set up again by the sweep in z (without computing areas) and preprocessing is resumed at first.
+        head = self.list
+        stop = head.prev[2]
+        for _ in hv_plus.sweep_3d(head, _no_area, remove_dominated=False, stop=first):
+            pass
+
+        staircase = [head.next[2]]
+        while staircase[-1] != head:
+            staircase.append(staircase[-1].cnext[1])
+        p = first
+        while p != stop:
+            p.ndomr = 0  # set again by preprocessing for the dominated points
+            p = p.next[2]
+        hv_plus.preprocessing(head, 3, first, staircase)
+
+        q = first.prev[2]
+        while q.ndomr > 0:
+            q = q.prev[2]
+        area = q.area  # 0 for the sentinel head.next[2]
+        volume = q.volume
+        z = q.x[2]
+        for p, added in hv_plus.sweep_3d(head, hv_plus.compute_area_simple, remove_dominated=False, start=first):
+            if area > 0:
+                volume += area * (p.x[2] - z)
+            area += added
+            z = p.x[2]
+            p.area = area
+            p.volume = volume
+        self.hv = volume + area * (self.ref[2] - z) if area > 0 else volume
+
+    def total_hv(self):
+        return self.hv
+
+    def get_size(self):
+        return self.n
+
+    def __len__(self):
+        return self.n
+
+    def get_points(self):
+        """Points in the order in which they were added"""
+        return np.array([p.x[:self.d] for p in history(self.list)]).reshape(-1, self.d)
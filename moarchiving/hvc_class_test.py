@@ -0,0 +1,145 @@
+import numpy as np
+import hv_plus
+from hvc import hvc3d
+from hvc_class import HV3DArchive, HV4DArchive, HVDeltaTracker
+
+"""
+Examples for the incremental 3-D archive (hvc_class.py).
+After each change, the hypervolume of the archive is compared to hv3dplus computed from scratch.
+"""
+
+def hv_from_scratch(points, ref):
+    if len(points) == 0:
+        return 0
+    head = hv_plus.setup_cdllist_points(np.asarray(points), ref)
+    hv_plus.preprocessing(head, 3)
+    hv = hv_plus.hv3dplus(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+print('Example for HV3DArchive - points are the same as in test.inp')
+points = [
+    [0.16, 0.86, 0.47],
+    [0.66, 0.37, 0.29],
+    [0.79, 0.79, 0.04],
+    [0.28, 0.99, 0.29],
+    [0.51, 0.37, 0.38],
+    [0.92, 0.62, 0.07],
+    [0.16, 0.53, 0.70],
+    [0.01, 0.98, 0.94],
+    [0.67, 0.17, 0.54],
+    [0.79, 0.72, 0.05]
+]
+ref = [1, 1, 1]
+
+archive = HV3DArchive(points[:5], ref)
+print("Initial size:", archive.get_size(), "hypervolume:", archive.total_hv())
+handles = []
+for point in points[5:]:
+    handles.append(archive.add_point(point))
+    print("Added", point, "size:", archive.get_size(), "hypervolume:", archive.total_hv())
+
+archive.remove(handles[1])
+print("Removed", points[6], "size:", archive.get_size(), "hypervolume:", archive.total_hv())
+archive.remove_point(points[0])
+print("Removed", points[0], "size:", archive.get_size(), "hypervolume:", archive.total_hv())
+archive.remove_point_at(0)
+print("Removed the oldest point, size:", archive.get_size(), "hypervolume:", archive.total_hv())
+print("Hypervolume from scratch:", hv_from_scratch(archive.get_points(), ref))
+print("\n")
+
+print('Example for HV3DArchive - random steady-state sequence')
+np.random.seed(1)
+archive = HV3DArchive(None, ref)
+for i in range(1000):
+    archive.add_point(np.random.rand(3))
+    if archive.get_size() > 50:
+        archive.remove_point_at(0)
+print("Size:", archive.get_size())
+print("Hypervolume (incremental):", archive.total_hv())
+print("Hypervolume from scratch:", hv_from_scratch(archive.get_points(), ref))
+print("\n")
+
+print('Example for HV3DArchive - removing the least contributors')
+np.random.seed(2)
+points = np.random.rand(1000, 3)
+points = 0.9 * points / np.linalg.norm(points, axis=1)[:, None]
+archive = HV3DArchive(points, ref)
+print("Size:", archive.get_size(), "hypervolume:", archive.total_hv())
+print("Index of the least contributor:", archive.get_least_contributor_index())
+while archive.get_size() > 10:
+    archive.remove_least_contributor()
+print("Size:", archive.get_size(), "hypervolume:", archive.total_hv())
+print("Contributions:", archive.get_contributions())
+print("Hypervolume from scratch:", hv_from_scratch(archive.get_points(), ref))
+print("\n")
+
+print('Example for HV3DArchive - bounded archive (adding a point, then removing the least contributor)')
+# the contributions are kept up to date, so each removal only looks at the points around the removed one
+np.random.seed(3)
+archive = HV3DArchive(None, ref)
+archive.get_contributions()
+for i in range(2000):
+    point = np.random.rand(3)
+    archive.add_point(0.9 * point / np.linalg.norm(point) + np.random.rand(3) * 0.05)
+    if archive.get_size() > 100:
+        archive.remove_least_contributor()
+print("Size:", archive.get_size())
+print("Same contributions as hvc3d from scratch:",
+      np.allclose(archive.get_contributions(), hvc3d(archive.get_points(), ref), rtol=0, atol=1e-12))
+print("Hypervolume (incremental):", archive.total_hv())
+print("Hypervolume from scratch:", hv_from_scratch(archive.get_points(), ref))
+print("\n")
+
+print('Example for HV3DArchive - changing the reference point')
+np.random.seed(3)
+points = np.random.rand(500, 3)
+points = points / np.linalg.norm(points, axis=1)[:, None]
+archive = HV3DArchive(points, [1.1, 1.1, 1.1])
+for new_ref in ([0.8, 0.9, 1.0], [0.6, 0.6, 0.6], [1.1, 1.1, 1.1]):
+    archive.change_reference_point(new_ref)
+    print("Reference point:", new_ref, "size:", archive.get_size(), "hypervolume:", archive.total_hv())
+    print("Hypervolume from scratch:", hv_from_scratch(archive.get_points(), new_ref))
+print("\n")
+
+print('Example for HV4DArchive - random steady-state sequence')
+ref = [1, 1, 1, 1]
+np.random.seed(6)
+points = np.random.rand(200, 4)
+points = 0.9 * points / np.linalg.norm(points, axis=1)[:, None]
+archive = HV4DArchive(points, ref)
+print("Size:", archive.get_size(), "hypervolume:", archive.total_hv())
+for i in range(20):
+    archive.add_point(0.95 * np.random.rand(4))
+    archive.remove_point_at(0)
+head = hv_plus.setup_cdllist_points(archive.get_points(), ref)
+print("Size:", archive.get_size())
+print("Hypervolume (incremental):", archive.total_hv())
+print("Hypervolume from scratch:", hv_plus.hv4dplusU(head))
+
+archive.change_reference_point([0.8, 0.8, 0.8, 0.8])
+head = hv_plus.setup_cdllist_points(archive.get_points(), [0.8, 0.8, 0.8, 0.8])
+print("Size after changing the reference point:", archive.get_size())
+print("Hypervolume (incremental):", archive.total_hv())
+print("Hypervolume from scratch:", hv_plus.hv4dplusU(head))
+
+# only the fourth coordinate changes, so the volumes of the slices are kept
+for new_ref in ([0.8, 0.8, 0.8, 0.5], [0.8, 0.8, 0.8, 0.9]):
+    archive.change_reference_point(new_ref)
+    head = hv_plus.setup_cdllist_points(archive.get_points(), new_ref)
+    print("Reference point:", new_ref, "size:", archive.get_size(), "hypervolume:", archive.total_hv(),
+          "from scratch:", hv_plus.hv4dplusU(head))
+print("\n")
+
+print('Example for HVDeltaTracker - populations that change by a few points per generation')
+ref = [1, 1, 1]
+np.random.seed(8)
+population = np.random.rand(300, 3)
+tracker = HVDeltaTracker(population, ref)
+for generation in range(5):
+    offspring = np.random.rand(10, 3)
+    replaced = np.random.choice(len(population), 10, replace=False)
+    tracker.update(added=offspring, removed=population[replaced])
+    population = np.vstack([np.delete(population, replaced, axis=0), offspring])
+    print("Generation", generation + 1, "hypervolume:", tracker.total_hv(),
+          "from scratch:", hv_from_scratch(population, ref))
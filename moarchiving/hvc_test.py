@@ -0,0 +1,91 @@
+import numpy as np
+import hv_plus
+from hvc import hvc3d, hvc4d, greedy_hv_subset
+
+"""
+Examples for computing all hypervolume contributions (hvc.py).
+Each contribution is compared to the difference of two hypervolumes computed with hv3dplus.
+"""
+
+def hv_from_scratch(points, ref):
+    head = hv_plus.setup_cdllist_points(np.asarray(points), ref)
+    hv_plus.preprocessing(head, 3)
+    hv = hv_plus.hv3dplus(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+def hv_from_scratch_4d(points, ref):
+    head = hv_plus.setup_cdllist_points(np.asarray(points), ref)
+    hv = hv_plus.hv4dplusU(head)
+    hv_plus.free_cdllist(head)
+    return hv
+
+print('Example for hvc3d - points are the same as in test.inp')
+points = np.array([
+    [0.16, 0.86, 0.47],
+    [0.66, 0.37, 0.29],
+    [0.79, 0.79, 0.04],
+    [0.28, 0.99, 0.29],
+    [0.51, 0.37, 0.38],
+    [0.92, 0.62, 0.07],
+    [0.16, 0.53, 0.70],
+    [0.01, 0.98, 0.94],
+    [0.67, 0.17, 0.54],
+    [0.79, 0.72, 0.05]
+])
+ref = [1, 1, 1]
+
+contributions = hvc3d(points, ref)
+hv = hv_from_scratch(points, ref)
+print("Contributions (hvc3d):", contributions)
+print("Contributions (hv3dplus):", np.array([hv - hv_from_scratch(np.delete(points, i, axis=0), ref) for i in range(len(points))]))
+print("\n")
+
+print('Example for hvc3d - dominated points (consider_dominated)')
+# the third point is dominated only by the second one, whose contribution it decreases, the fourth one is
+# dominated by the second and the third one, and the fifth one is a copy of the first one (both contribute 0)
+points_dom = np.concatenate([points[:2], [[0.7, 0.4, 0.3], [0.72, 0.45, 0.35], [0.16, 0.86, 0.47]], points[2:]])
+hv = hv_from_scratch(points_dom, ref)
+exact = np.array([hv - hv_from_scratch(np.delete(points_dom, i, axis=0), ref) for i in range(len(points_dom))])
+print("Contributions (hvc3d):", hvc3d(points_dom, ref))
+print("Contributions (hvc3d, consider_dominated):", hvc3d(points_dom, ref, consider_dominated=True))
+print("Same as with hv3dplus:", np.allclose(hvc3d(points_dom, ref, consider_dominated=True), exact))
+print("\n")
+
+print('Example for hvc4d - points are the same as in hv4d_test_05 (the first point dominates all the others)')
+points4d = np.array([
+    [0.0651, 0.0465, 0.0206, 0.1705],
+    [0.1560, 0.0977, 0.0581, 0.1834],
+    [0.3042, 0.1395, 0.1818, 0.2912],
+    [0.3046, 0.1560, 0.1997, 0.3664],
+    [0.3745, 0.2123, 0.2921, 0.4402],
+    [0.4561, 0.5248, 0.4319, 0.5142],
+    [0.5924, 0.7081, 0.6075, 0.5987],
+    [0.6011, 0.7852, 0.6842, 0.8084],
+    [0.6119, 0.9489, 0.7320, 0.8662],
+    [0.8324, 0.9507, 0.9656, 0.9699]
+])
+print("Contributions (hvc4d):", hvc4d(points4d, [1, 1, 1, 1]))
+np.random.seed(5)
+points4d = np.random.rand(6, 4)
+contributions = hvc4d(points4d, [1, 1, 1, 1])
+hv = hv_from_scratch_4d(points4d, [1, 1, 1, 1])
+print("Contributions (hvc4d):", contributions)
+print("Contributions (hv4dplusU):", np.array([hv - hv_from_scratch_4d(np.delete(points4d, i, axis=0), [1, 1, 1, 1]) for i in range(len(points4d))]))
+print("\n")
+
+print('Example for greedy_hv_subset - selecting 4 of the points from test.inp')
+selected, contributions = greedy_hv_subset(points, 4, ref)
+print("Selected points:", selected)
+print("Contributions:", contributions)
+print("Hypervolume of the selected points:", hv_from_scratch(points[selected], ref))
+print("\n")
+
+print('Example for greedy_hv_subset - selecting 5 of 30 random points in 4-D')
+np.random.seed(3)
+points = np.random.rand(30, 4)
+points = 0.9 * points / np.linalg.norm(points, axis=1)[:, None]
+ref = [1, 1, 1, 1]
+selected, contributions = greedy_hv_subset(points, 5, ref)
+print("Selected points:", selected)
+print("Contributions:", contributions)
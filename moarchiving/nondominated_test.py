@@ -0,0 +1,55 @@
+import time
+import numpy as np
+import hv_plus
+
+"""
+Examples for nondominated (hv_plus.py).
+The results are compared to a pairwise comparison of the points, and the hypervolume computed with the
+nondominated_only pre-pass of setup_cdllist_points is compared to the one computed with all points.
+"""
+
+def nondominated_pairwise(points):
+    # a point is dominated if another point is <= in all coordinates and < in one, or is equal and comes first
+    order = np.lexsort(points.T)
+    keep = np.ones(len(points), dtype=bool)
+    for k, i in enumerate(order):
+        others = points[order[:k]]
+        if np.any(np.all(others <= points[i], axis=1)):
+            keep[i] = False
+    return keep
+
+print('Example for nondominated - 3-D and 4-D points with ties')
+np.random.seed(3)
+for d in [3, 4]:
+    points = np.random.rand(300, d)
+    points = np.round(10 * points / points.sum(axis=1)[:, None]) + np.random.randint(0, 2, (300, 1))
+    mask = hv_plus.nondominated(points)
+    print(f"{d}-D: {mask.sum()} of {len(points)} points are nondominated, same as pairwise:",
+          np.array_equal(mask, nondominated_pairwise(points)))
+print("Indices of the first nondominated 4-D points:", hv_plus.nondominated(points, return_indices=True)[:10])
+print("\n")
+
+print('Example for nondominated - pre-pass of setup_cdllist_points for a mostly dominated 4-D input')
+points = np.random.rand(20000, 4)
+ref = [1, 1, 1, 1]
+for nondominated_only in [False, True]:
+    tic = time.perf_counter()
+    head = hv_plus.setup_cdllist_points(points, ref, nondominated_only=nondominated_only)
+    hv = hv_plus.hv4dplusU(head)
+    hv_plus.free_cdllist(head)
+    print(f"nondominated_only={nondominated_only}: hypervolume {hv}, time {time.perf_counter() - tic:.3f} s")
+print("\n")
+
+print('Example for nondominated - time on a 3-D front where all points stay on the staircase')
+# all points are nondominated, so the staircase grows to n points; the time should grow about
+# linearly with n (O(n log n)), i.e. by a factor of about 4 from one size to the next
+previous = None
+for n in [50000, 200000, 800000]:
+    z = np.linspace(0, 1, n)
+    points = np.c_[z, 1 - z, z]
+    tic = time.perf_counter()
+    mask = hv_plus.nondominated(points)
+    elapsed = time.perf_counter() - tic
+    ratio = f" ({elapsed / previous:.1f} times the time for the previous n)" if previous else ""
+    print(f"n = {n}: {mask.sum()} nondominated points, time {elapsed:.3f} s{ratio}")
+    previous = elapsed
@@ -0,0 +1,187 @@
+import os
+import struct
+import sys
+import numpy as np
+
+"""
+Binary format for point sets, so that large inputs are loaded with np.memmap instead of being parsed.
+A file consists of a header followed by the n x d coordinates in row-major (C) order:
+    magic b'HVPT', version (uint8), d (uint8), dtype ('f8' or 'f4'), n (uint64),
+    reference point (d float64 values, NaN if not given), padding up to a multiple of 64 bytes.
+All values are little-endian. The points are returned as an (n, d) array that can be passed
+directly to setup_cdllist_points and the other functions that take NumPy arrays.
+"""
+
+MAGIC = b'HVPT'
+VERSION = 1
+HEADER = struct.Struct('<4sBB2sQ')
+ALIGNMENT = 64
+DTYPES = {'f8': np.dtype('<f8'), 'f4': np.dtype('<f4')}
+
+
+def _data_offset(d):
+    size = HEADER.size + 8 * d
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _write_header(file, n, d, code, ref):
+    ref = np.full(d, np.nan) if ref is None else np.asarray(ref, dtype='<f8').reshape(d)
+    header = HEADER.pack(MAGIC, VERSION, d, code.encode(), n) + ref.tobytes()
+    file.write(header.ljust(_data_offset(d), b'\0'))
+
+
+def _dtype_code(dtype):
+    for code, dt in DTYPES.items():
+        if np.dtype(dtype) == dt:
+            return code
+    raise ValueError(f"unsupported dtype {dtype}, use float64 or float32")
+
+
+"""Writes the points (an (n, d) array) and the reference point (optional) to a binary file"""
+def write_points(filename, points, ref=None, dtype=np.float64):
+    code = _dtype_code(dtype)
+    points = np.ascontiguousarray(points, dtype=DTYPES[code])
+    n, d = points.shape
+    with open(filename, 'wb') as file:
+        _write_header(file, n, d, code, ref)
+        file.write(points.tobytes())
+
+
+"""Reads the header of a binary file and returns n, d, the dtype, the reference point (or None) and the data offset"""
+def read_header(filename):
+    with open(filename, 'rb') as file:
+        magic, version, d, code, n = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a binary point file")
+        if version != VERSION:
+            raise ValueError(f"unsupported version {version} of the binary point format")
+        ref = np.frombuffer(file.read(8 * d), dtype='<f8')
+    ref = None if np.isnan(ref).all() else ref.copy()
+    return n, d, DTYPES[code.decode()], ref, _data_offset(d)
+
+
+"""
+Loads the points of a binary file as an (n, d) array, mapped into memory (read-only) by default,
+and returns the points and the reference point stored in the file (None if not given).
+"""
+def load_points(filename, mmap=True):
+    n, d, dtype, ref, offset = read_header(filename)
+    if n == 0:
+        return np.empty((0, d), dtype=dtype), ref
+    if mmap:
+        points = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(n, d))
+    else:
+        points = np.fromfile(filename, dtype=dtype, count=n * d, offset=offset).reshape(n, d)
+    return points, ref
+
+
+def _dimension(text):
+    # Number of coordinates on the first line of text that is not blank or a comment, None if there is none
+    start = 0
+    while start < len(text):
+        stop = text.find('\n', start)
+        if stop < 0:
+            stop = len(text)
+        fields = text[start:stop].partition('#')[0].split()
+        if fields:
+            return len(fields)
+        start = stop + 1
+    return None
+
+
+def _parse(text, d):
+    # Coordinates of the lines in text as an (m, d) array, comments run from '#' to the end of the line
+    if '#' in text:
+        text = '\n'.join(line.partition('#')[0] for line in text.split('\n'))
+    return np.array(text.split(), dtype=float).reshape(-1, d)
+
+
+"""
+Parses a text file with one point per line (coordinates separated by whitespace) in chunks of
+about chunk_size bytes and yields each chunk as an (m, d) array, so that the whole text is never
+held in memory. Blank lines and comments (from '#' to the end of the line) are skipped.
+d is taken from the first line with coordinates if not given.
+"""
+def iter_text_points(filename, d=None, chunk_size=1 << 24):
+    with open(filename, 'r') as file:
+        rest = ''
+        while True:
+            block = file.read(chunk_size)
+            if not block:
+                break
+            block = rest + block
+            end = block.rfind('\n') + 1
+            if end == 0:  # no complete line yet
+                rest = block
+                continue
+            rest = block[end:]
+            if d is None:
+                d = _dimension(block[:end])
+                if d is None:  # only blank lines and comments so far
+                    continue
+            points = _parse(block[:end], d)
+            if len(points):
+                yield points
+        if d is None:
+            d = _dimension(rest)
+        if d is not None:
+            points = _parse(rest, d)
+            if len(points):
+                yield points
+
+
+"""Reads a text file with one point per line into an (n, d) array (see iter_text_points)"""
+def read_text_points(filename, d=None, chunk_size=1 << 24):
+    chunks = list(iter_text_points(filename, d, chunk_size))
+    if not chunks:
+        return np.empty((0, d or 0))
+    return np.concatenate(chunks)
+
+
+"""
+Converts a text file with one point per line to the binary format, one chunk at a time,
+and returns the number of points written.
+"""
+def convert_text(text_filename, binary_filename, ref=None, d=None, dtype=np.float64, chunk_size=1 << 24):
+    code = _dtype_code(dtype)
+    n = 0
+    with open(binary_filename, 'wb') as file:
+        for chunk in iter_text_points(text_filename, d, chunk_size):
+            if n == 0:
+                d = chunk.shape[1]
+                _write_header(file, 0, d, code, ref)
+            file.write(np.ascontiguousarray(chunk, dtype=DTYPES[code]).tobytes())
+            n += len(chunk)
+        if n == 0:
+            _write_header(file, 0, d or 0, code, ref)
+        else:
+            file.seek(0)
+            _write_header(file, n, d, code, ref)
+    return n
+
+
+"""
+Loads the points of filename: a binary file is mapped into memory, any other file is parsed
+as text. If a binary file with the same name and the extension .bin exists next to a text
+file and is not older than it, it is used instead (a stale binary file is ignored, the text file
+is parsed). Returns an (n, d) array.
+"""
+def load_any(filename):
+    binary = os.path.splitext(filename)[0] + '.bin'
+    if os.path.exists(binary) and (not os.path.exists(filename)
+                                   or os.path.getmtime(binary) >= os.path.getmtime(filename)):
+        filename = binary
+    with open(filename, 'rb') as file:
+        is_binary = file.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        return load_points(filename)[0]
+    return read_text_points(filename)
+
+
+if __name__ == '__main__':
+    # Converts the given text files to binary files with the same name and the extension .bin,
+    # e.g. python point_io.py tests/points_3d_*.txt
+    for text_filename in sys.argv[1:]:
+        binary_filename = os.path.splitext(text_filename)[0] + '.bin'
+        n = convert_text(text_filename, binary_filename)
+        print(f"{text_filename} -> {binary_filename} ({n} points)")
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import numpy as np
+import point_io
+
+"""
+Examples for the binary point format and the chunked text parser (point_io.py).
+The files are written to a temporary folder and the points read back are compared to the ones written.
+"""
+
+folder = tempfile.mkdtemp()
+np.random.seed(4)
+points = np.random.rand(1000, 3)
+
+print('Example for write_points/load_points - binary round trip')
+filename = os.path.join(folder, 'points.bin')
+for dtype, ref in [(np.float64, None), (np.float64, [1.1, 1.1, 1.1]), (np.float32, [2, 2, 2])]:
+    point_io.write_points(filename, points, ref=ref, dtype=dtype)
+    loaded, loaded_ref = point_io.load_points(filename, mmap=False)
+    print(f"dtype {np.dtype(dtype).name}, ref {ref}: shape {loaded.shape}, reference point {loaded_ref},",
+          "same points:", np.array_equal(loaded, points.astype(dtype)))
+point_io.write_points(filename, np.empty((0, 4)))
+print("Empty file:", point_io.load_points(filename)[0].shape)
+print("\n")
+
+print('Example for load_points - memory-mapped loading')
+point_io.write_points(filename, points, ref=[1, 1, 1])
+mapped, ref = point_io.load_points(filename)
+print("Mapped into memory:", isinstance(mapped, np.memmap), "read-only:", not mapped.flags.writeable,
+      "same points:", np.array_equal(mapped, points))
+del mapped
+print("\n")
+
+print('Example for iter_text_points - chunks that end in the middle of a line')
+text_filename = os.path.join(folder, 'points.txt')
+np.savetxt(text_filename, points)
+for chunk_size in [7, 100, 1 << 16]:
+    chunks = list(point_io.iter_text_points(text_filename, chunk_size=chunk_size))
+    print(f"chunk_size {chunk_size}: {len(chunks)} chunks, same points:",
+          np.array_equal(np.concatenate(chunks), np.loadtxt(text_filename)))
+with open(text_filename, 'a') as file:
+    file.write('0.5 0.5 0.5')  # last line without a newline
+print("Last line without a newline:", point_io.read_text_points(text_filename, chunk_size=100)[-1])
+print("\n")
+
+print('Example for iter_text_points - blank lines and comments')
+with open(text_filename, 'w') as file:
+    file.write('\n\n# points of a 3-D front\n   \n')
+    file.write('1 2 3\n\n4 5 6  # second point\n# 7 8 9\n0.5 0.25 0.125\n\n')
+for chunk_size in [5, 1 << 16]:
+    print(f"chunk_size {chunk_size}:", point_io.read_text_points(text_filename, chunk_size=chunk_size).tolist())
+with open(text_filename, 'w') as file:
+    file.write('\n# no points\n\n')
+print("Only blank lines and comments:", point_io.read_text_points(text_filename).shape)
+print("\n")
+
+print('Example for convert_text/load_any - text file converted to a binary file next to it')
+np.savetxt(text_filename, points, header='random 3-D points')
+binary_filename = os.path.join(folder, 'points.bin')
+n = point_io.convert_text(text_filename, binary_filename, ref=[1, 1, 1], chunk_size=1000)
+loaded = point_io.load_any(text_filename)
+print(f"{n} points written, loaded from the binary file:", isinstance(loaded, np.memmap),
+      "same points:", np.array_equal(loaded, np.loadtxt(text_filename)))
+np.savetxt(text_filename, points[:10])  # the text file is changed after the conversion
+stat = os.stat(binary_filename)
+os.utime(text_filename, (stat.st_atime, stat.st_mtime + 10))
+loaded = point_io.load_any(text_filename)
+print("Text file newer than the binary file, loaded from the text file:", not isinstance(loaded, np.memmap),
+      "same points:", np.array_equal(loaded, np.loadtxt(text_filename)))